@@ -8,10 +8,11 @@ from flask_cors import CORS
 import asyncio
 import json
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 from pathlib import Path
+import httpx
 
 # Load environment variables
 load_dotenv()
@@ -308,8 +309,17 @@ class TUHSGuidelineLoader:
 class AgnoBackendBridge:
     """Bridge between Express frontend and Agno Python backend with REAL TUHS guidelines"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            api_key: OpenRouter API key
+            http_client: Optional shared async HTTP client for the category agents'
+                OpenRouter calls (e.g. a pooled keep-alive client); when omitted
+                the OpenAI SDK creates its own. The caller that created the
+                client owns it and closes it; the bridge never does.
+        """
         self.api_key = api_key
+        self.http_client = http_client
         self.guideline_loader = TUHSGuidelineLoader()
         self.evidence_coordinator = FullEvidenceCoordinator(api_key)
         self.category_agents = self._init_category_agents(api_key)
@@ -330,6 +340,7 @@ class AgnoBackendBridge:
             api_key=api_key,
             base_url="https://openrouter.ai/api/v1",
             temperature=0.1,  # Low temperature for more deterministic, guideline-adherent responses
+            http_client=self.http_client,
             extra_headers={
                 "HTTP-Referer": "https://tuhs-abx.local",
                 "X-Title": "TUHS Antibiotic Steward"
@@ -25,12 +25,18 @@ Usage:
 """
 
 import logging
+import sys
 from typing import Dict, List, Any, Optional
 from lib.guideline_loader_v3 import GuidelineLoaderV3
 
 logger = logging.getLogger(__name__)
 
 
+def _intern(value: Any) -> Any:
+    """Intern categorical strings so comparisons against literals short-circuit on identity"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class DrugSelector:
     """Select appropriate antibiotics based on patient factors"""
 
@@ -97,7 +103,7 @@ class DrugSelector:
                 pregnancy_blocked_drugs = self._get_pregnancy_blocked_drugs(patient_data)
 
             # Step 4: Get regimens from infection guidelines
-            infection_type = patient_data.get('infection_type')
+            infection_type = _intern(patient_data.get('infection_type'))
             regimens = self.loader.get_infection_regimens(
                 infection_type=infection_type,
                 subcategory=infection_category,
@@ -162,7 +168,7 @@ class DrugSelector:
         Returns:
             Tuple of (infection_category, route_requirement)
         """
-        infection_type = patient_data.get('infection_type')
+        infection_type = _intern(patient_data.get('infection_type'))
 
         # UTI - Check for fever to distinguish pyelonephritis
         if infection_type == 'uti':
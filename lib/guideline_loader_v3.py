@@ -25,15 +25,33 @@ Usage:
     safe, reason = loader.check_pregnancy_safe('ciprofloxacin', trimester=2)
 """
 
+import asyncio
 import json
 import os
+import re
+import sys
 import logging
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib json module
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, with orjson when installed.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    catch the stdlib exception either way.
+    """
+    raw = path.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
 class GuidelineLoaderV3:
     """Load and query modular guideline JSON files"""
 
@@ -54,6 +72,11 @@ class GuidelineLoaderV3:
         self.infections = {}  # infection_id -> infection_data
         self.drugs = {}       # drug_id -> drug_data
         self.modifiers = {}   # modifier_type -> modifier_data
+        # (severity, compiled keyword alternation), severe first - built by load_all()
+        self._allergy_patterns: List[Tuple[str, re.Pattern]] = []
+        # Lookup tables built by load_all() - see _build_indexes()
+        self._regimen_index: Dict[Tuple[str, str], Tuple[Tuple[str, Dict[str, Any]], ...]] = {}
+        self._dose_index: Dict[Tuple[str, str], Dict[str, Any]] = {}
 
         logger.info(f"GuidelineLoader initialized with directory: {self.guidelines_dir}")
 
@@ -61,46 +84,88 @@ class GuidelineLoaderV3:
         """
         Load all guideline files according to index.json loading order
 
+        Files are read serially; async callers can await aload_all() instead.
+
         Returns:
             True if all files loaded successfully, False otherwise
         """
         try:
-            # Load index.json first
-            index_path = self.guidelines_dir / 'index.json'
-            if not index_path.exists():
-                logger.error(f"Index file not found: {index_path}")
+            relative_paths = self._load_index()
+            if relative_paths is None:
                 return False
 
-            with open(index_path, 'r') as f:
-                self.index_data = json.load(f)
-
-            logger.info(f"Loaded index.json version {self.index_data.get('version')}")
+            self._finish_loading(relative_paths, [self._read_file(path) for path in relative_paths])
+            return True
 
-            # Load files according to loading_order
-            loading_order = self.index_data.get('loading_order', [])
+        except Exception as e:
+            logger.error(f"Error loading guidelines: {e}", exc_info=True)
+            return False
 
-            for file_pattern in loading_order:
-                if '*' in file_pattern:
-                    # Handle wildcard patterns (e.g., infections/*.json)
-                    self._load_pattern(file_pattern)
-                else:
-                    # Load single file
-                    self._load_file(file_pattern)
+    async def aload_all(self) -> bool:
+        """
+        Load all guideline files, reading and parsing them concurrently in worker threads
 
-            # Validate cross-references
-            validation_errors = self._validate_cross_references()
-            if validation_errors:
-                logger.warning(f"Validation errors found: {validation_errors}")
+        Returns:
+            True if all files loaded successfully, False otherwise
+        """
+        try:
+            relative_paths = self._load_index()
+            if relative_paths is None:
+                return False
 
-            logger.info(f"Loaded {len(self.infections)} infections, {len(self.drugs)} drugs, {len(self.modifiers)} modifiers")
+            file_data = await asyncio.gather(
+                *(asyncio.to_thread(self._read_file, path) for path in relative_paths)
+            )
+            self._finish_loading(relative_paths, file_data)
             return True
 
         except Exception as e:
             logger.error(f"Error loading guidelines: {e}", exc_info=True)
             return False
 
-    def _load_pattern(self, pattern: str):
-        """Load all files matching a wildcard pattern"""
+    def _load_index(self) -> Optional[List[str]]:
+        """
+        Load index.json and expand its loading_order
+
+        Returns:
+            Relative paths of the guideline files in loading order, or None if index.json is missing
+        """
+        index_path = self.guidelines_dir / 'index.json'
+        if not index_path.exists():
+            logger.error(f"Index file not found: {index_path}")
+            return None
+
+        self.index_data = _read_json(index_path)
+
+        logger.info(f"Loaded index.json version {self.index_data.get('version')}")
+
+        relative_paths = []
+        for file_pattern in self.index_data.get('loading_order', []):
+            if '*' in file_pattern:
+                # Handle wildcard patterns (e.g., infections/*.json)
+                relative_paths.extend(self._expand_pattern(file_pattern))
+            else:
+                relative_paths.append(file_pattern)
+        return relative_paths
+
+    def _finish_loading(self, relative_paths: List[str], file_data: List[Optional[Any]]):
+        """Store the parsed files in loading order, then build lookup tables and validate"""
+        for relative_path, data in zip(relative_paths, file_data):
+            if data is not None:
+                self._store_file(relative_path, data)
+
+        self._allergy_patterns = self._compile_allergy_patterns()
+        self._build_indexes()
+
+        # Validate cross-references
+        validation_errors = self._validate_cross_references()
+        if validation_errors:
+            logger.warning(f"Validation errors found: {validation_errors}")
+
+        logger.info(f"Loaded {len(self.infections)} infections, {len(self.drugs)} drugs, {len(self.modifiers)} modifiers")
+
+    def _expand_pattern(self, pattern: str) -> List[str]:
+        """List the relative paths of all files matching a wildcard pattern"""
         # Convert pattern like "infections/*.json" to actual paths
         if pattern.startswith('modifiers/'):
             base_dir = self.guidelines_dir / 'modifiers'
@@ -113,46 +178,91 @@ class GuidelineLoaderV3:
             file_type = 'drug'
         else:
             logger.warning(f"Unknown pattern type: {pattern}")
-            return
+            return []
 
         # Find all .json files in directory
-        if base_dir.exists():
-            for file_path in base_dir.glob('*.json'):
-                relative_path = f"{file_type}s/{file_path.name}"
-                self._load_file(relative_path)
+        if not base_dir.exists():
+            return []
+        return [f"{file_type}s/{file_path.name}" for file_path in base_dir.glob('*.json')]
+
+    def _read_file(self, relative_path: str) -> Optional[Any]:
+        """
+        Read and parse a single JSON file
 
-    def _load_file(self, relative_path: str):
-        """Load a single JSON file"""
+        Safe to run in a worker thread: it touches no loader state.
+
+        Returns:
+            Parsed file contents, or None if the file is missing or invalid
+        """
         file_path = self.guidelines_dir / relative_path
 
         if not file_path.exists():
             logger.warning(f"File not found: {file_path}")
-            return
+            return None
 
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-
-            # Categorize by file type
-            if relative_path.startswith('modifiers/'):
-                modifier_name = file_path.stem  # e.g., 'allergy_rules'
-                self.modifiers[modifier_name] = data
-                logger.debug(f"Loaded modifier: {modifier_name}")
-
-            elif relative_path.startswith('infections/'):
-                infection_id = file_path.stem  # e.g., 'uti'
-                self.infections[infection_id] = data
-                logger.debug(f"Loaded infection: {infection_id}")
-
-            elif relative_path.startswith('drugs/'):
-                drug_id = file_path.stem  # e.g., 'ceftriaxone'
-                self.drugs[drug_id] = data
-                logger.debug(f"Loaded drug: {drug_id}")
-
+            return _read_json(file_path)
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error in {file_path}: {e}")
         except Exception as e:
             logger.error(f"Error loading {file_path}: {e}", exc_info=True)
+        return None
+
+    def _store_file(self, relative_path: str, data: Any):
+        """Categorize a parsed file by type"""
+        stem = sys.intern(Path(relative_path).stem)
+
+        if relative_path.startswith('modifiers/'):
+            self.modifiers[stem] = data  # e.g., 'allergy_rules'
+            logger.debug(f"Loaded modifier: {stem}")
+
+        elif relative_path.startswith('infections/'):
+            self.infections[stem] = data  # e.g., 'uti'
+            logger.debug(f"Loaded infection: {stem}")
+
+        elif relative_path.startswith('drugs/'):
+            self.drugs[stem] = data  # e.g., 'ceftriaxone'
+            logger.debug(f"Loaded drug: {stem}")
+
+    def _build_indexes(self):
+        """
+        Flatten the loaded guidelines into lookup tables for the query methods
+
+        - _regimen_index: (infection_type, allergy_status) -> ((category name lowercased,
+          regimen with category context), ...) in file order
+        - _dose_index: (drug_id, indication) -> dose info with drug metadata attached
+
+        Key strings are interned, so probes with interned identifiers match on identity.
+        """
+        regimen_index = {}
+        for infection_id, infection_data in self.infections.items():
+            for category in infection_data.get('categories', []):
+                category_name = category.get('category')
+                category_lower = (category_name or '').lower()
+                for regimen in category.get('regimens', []):
+                    # Add category context to regimen
+                    regimen_with_context = regimen.copy()
+                    regimen_with_context['category'] = category_name
+                    regimen_with_context['route'] = category.get('route', regimen.get('route'))
+                    regimen_with_context['duration'] = regimen.get('duration', category.get('duration'))
+                    allergy_status = regimen.get('allergy_status')
+                    if isinstance(allergy_status, str):
+                        allergy_status = sys.intern(allergy_status)
+                    key = (infection_id, allergy_status)
+                    regimen_index.setdefault(key, []).append((category_lower, regimen_with_context))
+        self._regimen_index = {key: tuple(entries) for key, entries in regimen_index.items()}
+
+        dose_index = {}
+        for drug_id, drug_data in self.drugs.items():
+            metadata = {
+                'drug_id': drug_id,
+                'drug_name': drug_data.get('drug_name', drug_id),
+                'class': drug_data.get('class'),
+            }
+            by_indication = drug_data.get('dosing', {}).get('by_indication', {})
+            for indication, dose_info in by_indication.items():
+                dose_index[(drug_id, sys.intern(indication))] = {**dose_info, **metadata}
+        self._dose_index = dose_index
 
     def _validate_cross_references(self) -> List[str]:
         """
@@ -194,32 +304,20 @@ class GuidelineLoaderV3:
 
         Returns:
             List of regimen dictionaries with drug IDs and metadata
+            (shared with the loader's index - treat them as read-only)
         """
         if infection_type not in self.infections:
             logger.warning(f"Unknown infection type: {infection_type}")
             return []
 
-        infection_data = self.infections[infection_type]
-        categories = infection_data.get('categories', [])
+        entries = self._regimen_index.get((infection_type, allergy_status), ())
 
         # Filter by subcategory if provided
         if subcategory:
-            categories = [c for c in categories if subcategory.lower() in c.get('category', '').lower()]
-
-        # Extract regimens matching allergy status
-        matching_regimens = []
-        for category in categories:
-            regimens = category.get('regimens', [])
-            for regimen in regimens:
-                if regimen.get('allergy_status') == allergy_status:
-                    # Add category context to regimen
-                    regimen_with_context = regimen.copy()
-                    regimen_with_context['category'] = category.get('category')
-                    regimen_with_context['route'] = category.get('route', regimen.get('route'))
-                    regimen_with_context['duration'] = regimen.get('duration', category.get('duration'))
-                    matching_regimens.append(regimen_with_context)
+            subcategory_lower = subcategory.lower()
+            return [regimen for category_lower, regimen in entries if subcategory_lower in category_lower]
 
-        return matching_regimens
+        return [regimen for _, regimen in entries]
 
     def get_drug_dose(
         self,
@@ -243,21 +341,18 @@ class GuidelineLoaderV3:
             logger.warning(f"Unknown drug: {drug_id}")
             return None
 
-        drug_data = self.drugs[drug_id]
-        dosing = drug_data.get('dosing', {})
-        by_indication = dosing.get('by_indication', {})
-
-        # Get base dose for indication
-        if indication not in by_indication:
+        # Get base dose (with drug metadata) for indication
+        base_dose = self._dose_index.get((drug_id, indication))
+        if base_dose is None:
             # Try to find partial match (e.g., 'bacteremia' matches 'bacteremia_mrsa')
+            by_indication = self.drugs[drug_id].get('dosing', {}).get('by_indication', {})
             matching_indications = [ind for ind in by_indication.keys() if indication in ind]
-            if matching_indications:
-                indication = matching_indications[0]
-            else:
+            if not matching_indications:
                 logger.warning(f"No dosing found for {drug_id} + {indication}")
                 return None
+            base_dose = self._dose_index[(drug_id, matching_indications[0])]
 
-        dose_info = by_indication[indication].copy()
+        dose_info = base_dose.copy()
 
         # Apply renal adjustment if needed
         if crcl is not None:
@@ -267,11 +362,6 @@ class GuidelineLoaderV3:
                 dose_info['original_dose'] = dose_info.get('dose')
                 dose_info.update(renal_adjustment)
 
-        # Add drug metadata
-        dose_info['drug_id'] = drug_id
-        dose_info['drug_name'] = drug_data.get('drug_name', drug_id)
-        dose_info['class'] = drug_data.get('class')
-
         return dose_info
 
     def _get_renal_adjustment(self, drug_id: str, crcl: float) -> Optional[Dict[str, Any]]:
@@ -368,6 +458,24 @@ class GuidelineLoaderV3:
         # Default to safe if not explicitly contraindicated
         return True, None
 
+    def _compile_allergy_patterns(self) -> List[Tuple[str, re.Pattern]]:
+        """
+        Compile each severity's allergy_rules keywords into one alternation
+
+        Returns:
+            List of (severity, pattern) pairs, severe first (more specific)
+        """
+        allergy_rules = self.modifiers.get('allergy_rules', {})
+        classification = allergy_rules.get('allergy_classification', {})
+
+        patterns = []
+        for severity in ('severe', 'mild'):
+            keywords = classification.get(severity, {}).get('keywords', [])
+            if keywords:
+                alternation = '|'.join(re.escape(keyword.lower()) for keyword in keywords)
+                patterns.append((severity, re.compile(alternation)))
+        return patterns
+
     def classify_allergy_severity(self, allergy_description: str) -> str:
         """
         Classify allergy severity from free-text description
@@ -381,22 +489,12 @@ class GuidelineLoaderV3:
         if not allergy_description:
             return 'unknown'
 
-        allergy_rules = self.modifiers.get('allergy_rules', {})
-        classification = allergy_rules.get('allergy_classification', {})
-
         allergy_lower = allergy_description.lower()
 
-        # Check severe keywords first (more specific)
-        severe_keywords = classification.get('severe', {}).get('keywords', [])
-        for keyword in severe_keywords:
-            if keyword.lower() in allergy_lower:
-                return 'severe'
-
-        # Check mild keywords
-        mild_keywords = classification.get('mild', {}).get('keywords', [])
-        for keyword in mild_keywords:
-            if keyword.lower() in allergy_lower:
-                return 'mild'
+        # Severe keywords are checked first (more specific), then mild
+        for severity, pattern in self._allergy_patterns:
+            if pattern.search(allergy_lower):
+                return severity
 
         return 'unknown'
 
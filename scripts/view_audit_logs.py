@@ -3,24 +3,44 @@
 Utility script to view and analyze audit logs
 """
 import sys
-import json
 from pathlib import Path
 from datetime import datetime, timedelta
 import argparse
+import importlib.util
 
-# Add parent directory to path so we can import audit_logger
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from audit_logger import get_log_summary, DEFAULT_LOG_DIR
+# audit_logger and json/orjson are imported inside the functions that use them,
+# so `--help` and argument errors don't pay for loading them. Without
+# `pip install -e .`, fall back to the repo root on the path so the script
+# still runs from a fresh checkout (find_spec locates it without importing).
+if importlib.util.find_spec('audit_logger') is None:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def _json_codec():
+    """Return (loads, dumps_indent) using orjson when installed, else stdlib json.
+
+    dumps_indent pretty-prints an object as UTF-8 JSON bytes.
+    """
+    try:
+        import orjson
+    except ImportError:  # orjson is optional - fall back to the stdlib json module
+        import json
+        return json.loads, lambda obj: json.dumps(obj, indent=2).encode()
+    return orjson.loads, lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
 
 
 def view_today():
     """View today's audit log summary"""
+    from audit_logger import get_log_summary
+
     summary = get_log_summary()
     print_summary(summary)
 
 
 def view_date(date_str):
     """View audit log summary for a specific date"""
+    from audit_logger import get_log_summary
+
     try:
         target_date = datetime.strptime(date_str, "%Y-%m-%d")
         summary = get_log_summary(date=target_date)
@@ -32,11 +52,14 @@ def view_date(date_str):
 
 def view_recent(days=7):
     """View audit log summaries for the past N days"""
+    from audit_logger import get_log_summary
+
     print(f"\n📊 Audit Log Summary - Past {days} Days")
     print("=" * 80)
 
+    now = datetime.now()
     for i in range(days):
-        target_date = datetime.now() - timedelta(days=i)
+        target_date = now - timedelta(days=i)
         summary = get_log_summary(date=target_date)
 
         if summary['total_requests'] > 0:
@@ -49,6 +72,8 @@ def view_recent(days=7):
 
 def view_raw(date_str=None):
     """View raw audit log entries"""
+    from audit_logger import DEFAULT_LOG_DIR, LOG_READ_BUFFER_SIZE
+
     if date_str:
         try:
             target_date = datetime.strptime(date_str, "%Y-%m-%d")
@@ -71,15 +96,22 @@ def view_raw(date_str=None):
     print(f"\n📄 Raw Audit Log: {log_file}")
     print("=" * 80)
 
-    with open(log_file, 'r', encoding='utf-8') as f:
+    loads, dumps_indent = _json_codec()
+
+    # Entries are written as bytes straight to stdout, so flush the text layer first
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+
+    with open(log_file, 'rb', buffering=LOG_READ_BUFFER_SIZE) as f:
         for i, line in enumerate(f, 1):
-            if line.strip():
+            if not line.isspace():
                 try:
-                    entry = json.loads(line)
-                    print(f"\n--- Entry {i} ---")
-                    print(json.dumps(entry, indent=2))
-                except json.JSONDecodeError:
-                    print(f"⚠️  Line {i}: Invalid JSON")
+                    entry = loads(line)
+                    out.write(f"\n--- Entry {i} ---\n".encode())
+                    out.write(dumps_indent(entry) + b"\n")
+                except ValueError:  # json.JSONDecodeError / orjson.JSONDecodeError
+                    out.write(f"⚠️  Line {i}: Invalid JSON\n".encode())
+    out.flush()
 
 
 def print_summary(summary):
@@ -94,7 +126,7 @@ def print_summary(summary):
 
     if summary['categories']:
         print(f"\n📂 Infection Categories:")
-        for category, count in sorted(summary['categories'].items(), key=lambda x: x[1], reverse=True):
+        for category, count in summary['categories_sorted']:
             print(f"   • {category}: {count}")
 
     print("\n" + "=" * 80)
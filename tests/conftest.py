@@ -4,8 +4,141 @@ Pytest configuration and shared fixtures
 import pytest
 import os
 import json
+import functools
+import contextlib
+import hashlib
+import pickle
+import re
+from pathlib import Path
 from typing import Dict
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib json module
+    orjson = None
+
+
+# Read-only reference data shared by the fixtures below.
+# Built once at import - tests must not mutate these.
+
+_SAMPLE_PATIENT_SIMPLE = {
+    'age': '45',
+    'gender': 'female',
+    'location': 'Ward',
+    'infection_type': 'pyelonephritis',
+    'gfr': '85',
+    'allergies': 'None'
+}
+
+
+_SAMPLE_PATIENT_SEVERE_ALLERGY = {
+    'age': '70',
+    'gender': 'male',
+    'location': 'Ward',
+    'infection_type': 'bacteremia',
+    'gfr': '50',
+    'allergies': 'Penicillin (anaphylaxis)'
+}
+
+
+_SAMPLE_PATIENT_PREGNANT = {
+    'age': '28',
+    'gender': 'female',
+    'location': 'Ward',
+    'infection_type': 'pyelonephritis',
+    'gfr': '95',
+    'allergies': 'None',
+    'inf_risks': 'Pregnancy - 26 weeks gestation'
+}
+
+
+_SAMPLE_PATIENT_ICU_SEPSIS = {
+    'age': '65',
+    'gender': 'male',
+    'location': 'ICU',
+    'infection_type': 'sepsis',
+    'gfr': '35',
+    'allergies': 'None',
+    'inf_risks': 'Septic shock, intubated, unknown source'
+}
+
+
+_SAMPLE_PATIENT_RENAL_FAILURE = {
+    'age': '80',
+    'gender': 'female',
+    'location': 'Ward',
+    'infection_type': 'bacteremia',
+    'gfr': '12',
+    'allergies': 'None',
+    'inf_risks': 'Stage 5 CKD, not on dialysis'
+}
+
+
+_SAMPLE_PATIENT_MRSA = {
+    'age': '60',
+    'gender': 'male',
+    'location': 'Ward',
+    'infection_type': 'bacteremia',
+    'gfr': '60',
+    'allergies': 'None',
+    'inf_risks': 'MRSA nares positive, central line'
+}
+
+
+_EXPECTED_DRUGS_PYELONEPHRITIS = {
+    'no_allergy': ['ceftriaxone'],
+    'mild_pcn_allergy': ['ceftriaxone'],
+    'severe_pcn_allergy': ['aztreonam'],
+    'pregnant': ['ceftriaxone']
+}
+
+
+_EXPECTED_DRUGS_BACTEREMIA = {
+    'no_allergy': ['cefepime', 'piperacillin-tazobactam', 'vancomycin'],
+    'mild_pcn_allergy': ['cefepime', 'vancomycin'],
+    'severe_pcn_allergy': ['aztreonam', 'vancomycin'],
+    'mrsa': ['vancomycin']
+}
+
+
+_FORBIDDEN_DRUGS_BY_ALLERGY = {
+    'severe_pcn_allergy': [
+        'penicillin', 'ampicillin', 'piperacillin',
+        'ceftriaxone', 'cefepime', 'cefazolin',
+        'ceftazidime', 'cefotaxime', 'cefuroxime'
+    ],
+    'pregnancy': [
+        'ciprofloxacin', 'levofloxacin', 'moxifloxacin',
+        'tetracycline', 'doxycycline'
+    ]
+}
+
+
+_MOCK_VALIDATION_RESULT = {
+    "status": "APPROVED",
+    "confidence": 0.95,
+    "issues": [],
+    "suggested_corrections": [],
+    "severity": None,
+    "notes": "Recommendation looks good"
+}
+
+
+_MOCK_VALIDATION_RESULT_WITH_ISSUES = {
+    "status": "REQUIRES_REVIEW",
+    "confidence": 0.4,
+    "issues": [
+        "Cephalosporin recommended for severe PCN allergy",
+        "Missing loading dose for meningitis"
+    ],
+    "suggested_corrections": [
+        "Use aztreonam instead of cefepime",
+        "Add vancomycin loading dose 25-30 mg/kg"
+    ],
+    "severity": "CRITICAL",
+    "notes": "Critical safety issues detected"
+}
+
 
 @pytest.fixture(scope="session")
 def api_key():
@@ -16,130 +149,195 @@ def api_key():
     return key
 
 
+@pytest.fixture(scope="session")
+def backend_cassette():
+    """Factory for recorded-HTTP cassettes around live backend calls - session scoped
+
+    With vcrpy installed, ``with backend_cassette(name):`` records OpenRouter
+    traffic to tests/cassettes/<name>.yaml on the first run and replays it
+    afterwards. Set VCR_RECORD_MODE=none in CI to replay only. Without vcrpy
+    it is a no-op and requests go to the live API.
+    """
+    try:
+        import vcr
+    except ImportError:
+        return lambda name: contextlib.nullcontext()
+
+    recorder = vcr.VCR(
+        cassette_library_dir=os.path.join(os.path.dirname(__file__), 'cassettes'),
+        record_mode=os.getenv('VCR_RECORD_MODE', 'new_episodes'),
+        # Every call hits the same endpoint, so requests are told apart by body
+        match_on=['method', 'uri', 'body'],
+        filter_headers=['authorization'],
+    )
+    return lambda name: recorder.use_cassette(f'{name}.yaml')
+
+
 @pytest.fixture(scope="session")
 def test_data_dir():
     """Directory for test data files"""
     return os.path.join(os.path.dirname(__file__), 'test_data')
 
 
+def _load_json(path):
+    """Parse a guideline JSON file, with orjson when installed"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+@pytest.fixture(scope="session")
+def abx_selection_data():
+    """Parsed ABX_Selection.json - session scoped, read-only"""
+    return _load_json('ABX_Selection.json')
+
+
+@pytest.fixture(scope="session")
+def abx_dosing_data():
+    """Parsed ABX_Dosing.json - session scoped, read-only"""
+    return _load_json('ABX_Dosing.json')
+
+
+@pytest.fixture(scope="session")
+def abx_legacy_data():
+    """Parsed legacy ABXguideInp.json - session scoped, read-only"""
+    return _load_json('ABXguideInp.json')
+
+
+def _stat_key(paths):
+    """Hash the path, mtime and size of each file - changes whenever any file does"""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        stat = path.stat()
+        digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+@pytest.fixture(scope="session")
+def guideline_loader_v3(request):
+    """GuidelineLoaderV3 with every guideline file loaded - session scoped, read-only
+
+    The loaded instance is pickled into the pytest cache, keyed on every
+    guideline file and the loader module itself, so later runs skip parsing
+    until one of them changes. Without the cache plugin it is simply built.
+    """
+    from lib import guideline_loader_v3 as loader_module
+
+    loader = loader_module.GuidelineLoaderV3()
+    cache = getattr(request.config, 'cache', None)
+    if cache is None:
+        assert loader.load_all(), "Failed to load guidelines"
+        return loader
+
+    key = _stat_key([*sorted(loader.guidelines_dir.rglob('*.json')), Path(loader_module.__file__)])
+    cache_dir = cache.mkdir('guidelines_v3')
+    pickle_path = cache_dir / f'{key}.pkl'
+    try:
+        with open(pickle_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, AttributeError, ImportError, pickle.PickleError):
+        pass  # cache miss or unreadable entry - rebuild below
+
+    assert loader.load_all(), "Failed to load guidelines"
+    for stale in cache_dir.glob('*.pkl'):
+        if stale != pickle_path:
+            stale.unlink(missing_ok=True)
+    # Write-then-rename so a concurrent xdist worker never reads a partial pickle
+    tmp_path = pickle_path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(loader, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, pickle_path)
+    return loader
+
+
+def _freeze(value):
+    """Recursively convert dicts/lists into hashable tuples for use as a cache key"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _memoize(func):
+    """Cache func(patient_data) results keyed on the frozen patient_data"""
+    cache = {}
+
+    @functools.wraps(func)
+    def wrapper(patient_data):
+        key = _freeze(patient_data)
+        if key not in cache:
+            cache[key] = func(patient_data)
+        return cache[key]
+
+    return wrapper
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Recommendation engine shared across all test modules - session scoped
+
+    get_recommendation is deterministic, so results are memoized per input:
+    structurally identical patient inputs are only computed once.
+    """
+    from lib.recommendation_engine import RecommendationEngine
+    engine = RecommendationEngine()
+    engine.get_recommendation = _memoize(engine.get_recommendation)
+    return engine
+
+
 @pytest.fixture
 def sample_patient_simple():
     """Simple patient case - no allergies, normal renal function"""
-    return {
-        'age': '45',
-        'gender': 'female',
-        'location': 'Ward',
-        'infection_type': 'pyelonephritis',
-        'gfr': '85',
-        'allergies': 'None'
-    }
+    return _SAMPLE_PATIENT_SIMPLE
 
 
 @pytest.fixture
 def sample_patient_severe_allergy():
     """Patient with severe penicillin allergy"""
-    return {
-        'age': '70',
-        'gender': 'male',
-        'location': 'Ward',
-        'infection_type': 'bacteremia',
-        'gfr': '50',
-        'allergies': 'Penicillin (anaphylaxis)'
-    }
+    return _SAMPLE_PATIENT_SEVERE_ALLERGY
 
 
 @pytest.fixture
 def sample_patient_pregnant():
     """Pregnant patient"""
-    return {
-        'age': '28',
-        'gender': 'female',
-        'location': 'Ward',
-        'infection_type': 'pyelonephritis',
-        'gfr': '95',
-        'allergies': 'None',
-        'inf_risks': 'Pregnancy - 26 weeks gestation'
-    }
+    return _SAMPLE_PATIENT_PREGNANT
 
 
 @pytest.fixture
 def sample_patient_icu_sepsis():
     """ICU patient with septic shock"""
-    return {
-        'age': '65',
-        'gender': 'male',
-        'location': 'ICU',
-        'infection_type': 'sepsis',
-        'gfr': '35',
-        'allergies': 'None',
-        'inf_risks': 'Septic shock, intubated, unknown source'
-    }
+    return _SAMPLE_PATIENT_ICU_SEPSIS
 
 
 @pytest.fixture
 def sample_patient_renal_failure():
     """Patient with severe renal impairment"""
-    return {
-        'age': '80',
-        'gender': 'female',
-        'location': 'Ward',
-        'infection_type': 'bacteremia',
-        'gfr': '12',
-        'allergies': 'None',
-        'inf_risks': 'Stage 5 CKD, not on dialysis'
-    }
+    return _SAMPLE_PATIENT_RENAL_FAILURE
 
 
 @pytest.fixture
 def sample_patient_mrsa():
     """Patient with MRSA colonization"""
-    return {
-        'age': '60',
-        'gender': 'male',
-        'location': 'Ward',
-        'infection_type': 'bacteremia',
-        'gfr': '60',
-        'allergies': 'None',
-        'inf_risks': 'MRSA nares positive, central line'
-    }
+    return _SAMPLE_PATIENT_MRSA
 
 
 @pytest.fixture
 def expected_drugs_pyelonephritis():
     """Expected drug recommendations for pyelonephritis"""
-    return {
-        'no_allergy': ['ceftriaxone'],
-        'mild_pcn_allergy': ['ceftriaxone'],
-        'severe_pcn_allergy': ['aztreonam'],
-        'pregnant': ['ceftriaxone']
-    }
+    return _EXPECTED_DRUGS_PYELONEPHRITIS
 
 
 @pytest.fixture
 def expected_drugs_bacteremia():
     """Expected drug recommendations for bacteremia"""
-    return {
-        'no_allergy': ['cefepime', 'piperacillin-tazobactam', 'vancomycin'],
-        'mild_pcn_allergy': ['cefepime', 'vancomycin'],
-        'severe_pcn_allergy': ['aztreonam', 'vancomycin'],
-        'mrsa': ['vancomycin']
-    }
+    return _EXPECTED_DRUGS_BACTEREMIA
 
 
 @pytest.fixture
 def forbidden_drugs_by_allergy():
     """Drugs that must never be recommended for certain allergies"""
-    return {
-        'severe_pcn_allergy': [
-            'penicillin', 'ampicillin', 'piperacillin',
-            'ceftriaxone', 'cefepime', 'cefazolin',
-            'ceftazidime', 'cefotaxime', 'cefuroxime'
-        ],
-        'pregnancy': [
-            'ciprofloxacin', 'levofloxacin', 'moxifloxacin',
-            'tetracycline', 'doxycycline'
-        ]
-    }
+    return _FORBIDDEN_DRUGS_BY_ALLERGY
 
 
 def pytest_configure(config):
@@ -155,6 +353,11 @@ def pytest_configure(config):
     )
 
 
+# Whole name tokens that mark a test as a critical safety test. Letters and digits
+# continue a token, so "_", "-" and "[" separate them and "address" never matches "dress".
+_CRITICAL_NAME_RE = re.compile(r"(?<![a-z0-9])(?:anaphylaxis|sjs|dress)(?![a-z0-9])", re.IGNORECASE)
+
+
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers dynamically"""
     for item in items:
@@ -163,7 +366,11 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(pytest.mark.slow)
 
         # Add critical marker to safety tests
-        if 'allergy' in item.keywords or 'anaphylaxis' in item.name.lower():
+        if 'allergy' in item.keywords:
+            item.add_marker(pytest.mark.critical)
+            continue
+
+        if _CRITICAL_NAME_RE.search(item.name):
             item.add_marker(pytest.mark.critical)
 
 
@@ -177,33 +384,13 @@ def reset_between_tests():
 @pytest.fixture
 def mock_validation_result():
     """Mock validation result for testing"""
-    return {
-        "status": "APPROVED",
-        "confidence": 0.95,
-        "issues": [],
-        "suggested_corrections": [],
-        "severity": None,
-        "notes": "Recommendation looks good"
-    }
+    return _MOCK_VALIDATION_RESULT
 
 
 @pytest.fixture
 def mock_validation_result_with_issues():
     """Mock validation result with issues flagged"""
-    return {
-        "status": "REQUIRES_REVIEW",
-        "confidence": 0.4,
-        "issues": [
-            "Cephalosporin recommended for severe PCN allergy",
-            "Missing loading dose for meningitis"
-        ],
-        "suggested_corrections": [
-            "Use aztreonam instead of cefepime",
-            "Add vancomycin loading dose 25-30 mg/kg"
-        ],
-        "severity": "CRITICAL",
-        "notes": "Critical safety issues detected"
-    }
+    return _MOCK_VALIDATION_RESULT_WITH_ISSUES
 
 
 # Performance tracking
@@ -20,747 +20,797 @@ Input Fields:
 """
 
 import pytest
+import re
 import sys
-from pathlib import Path
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
 
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
 
-from lib.recommendation_engine import RecommendationEngine
+@dataclass(frozen=True, slots=True)
+class Case:
+    """One comprehensive test case; optional expectations are skipped when None"""
+    id: int
+    name: str
+    input: Dict[str, Any]
+    expected_route: Optional[str] = None
+    expected_drugs: Optional[Sequence[str]] = None
+    expected_drugs_contains: Optional[Sequence[str]] = None
+    forbidden_drugs: Optional[Sequence[str]] = None
+    expected_allergy: Optional[str] = None
+    expect_warnings: bool = False
 
 
-@pytest.fixture(scope="module")
-def engine():
-    """Create recommendation engine once for all tests"""
-    return RecommendationEngine()
-
-
-# Test data organized by category
-TEST_CASES = []
+# Test data organized by category; sections are joined into TEST_CASES below
 
 # =============================================================================
 # SECTION 1: UTI / PYELONEPHRITIS (20 cases)
 # =============================================================================
 
 # 1-5: Basic pyelonephritis variations
-TEST_CASES.extend([
-    {
-        'id': 1,
-        'name': 'Young adult pyelonephritis, normal renal',
-        'input': {'age': 25, 'infection_type': 'uti', 'fever': True, 'crcl': 95},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_route': 'IV'
-    },
-    {
-        'id': 2,
-        'name': 'Elderly pyelonephritis, mild renal impairment',
-        'input': {'age': 75, 'infection_type': 'uti', 'fever': True, 'crcl': 45},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_route': 'IV',
-        'expect_warnings': True  # Elderly + renal impairment
-    },
-    {
-        'id': 3,
-        'name': 'Middle age pyelonephritis, moderate renal impairment',
-        'input': {'age': 55, 'infection_type': 'uti', 'fever': True, 'crcl': 35},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_route': 'IV'
-    },
-    {
-        'id': 4,
-        'name': 'Young pyelonephritis, severe renal impairment',
-        'input': {'age': 40, 'infection_type': 'uti', 'fever': True, 'crcl': 15},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_route': 'IV',
-        'expect_warnings': True  # Severe renal impairment
-    },
-    {
-        'id': 5,
-        'name': 'Pyelonephritis with flank pain (no explicit fever)',
-        'input': {'age': 50, 'infection_type': 'uti', 'presentation': 'flank pain', 'crcl': 80},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_route': 'IV'
-    },
-])
+_PYELO_BASIC = (
+    Case(
+        id=1,
+        name='Young adult pyelonephritis, normal renal',
+        input={'age': 25, 'infection_type': 'uti', 'fever': True, 'crcl': 95},
+        expected_drugs=['Ceftriaxone'],
+        expected_route='IV'
+    ),
+    Case(
+        id=2,
+        name='Elderly pyelonephritis, mild renal impairment',
+        input={'age': 75, 'infection_type': 'uti', 'fever': True, 'crcl': 45},
+        expected_drugs=['Ceftriaxone'],
+        expected_route='IV',
+        expect_warnings=True  # Elderly + renal impairment
+    ),
+    Case(
+        id=3,
+        name='Middle age pyelonephritis, moderate renal impairment',
+        input={'age': 55, 'infection_type': 'uti', 'fever': True, 'crcl': 35},
+        expected_drugs=['Ceftriaxone'],
+        expected_route='IV'
+    ),
+    Case(
+        id=4,
+        name='Young pyelonephritis, severe renal impairment',
+        input={'age': 40, 'infection_type': 'uti', 'fever': True, 'crcl': 15},
+        expected_drugs=['Ceftriaxone'],
+        expected_route='IV',
+        expect_warnings=True  # Severe renal impairment
+    ),
+    Case(
+        id=5,
+        name='Pyelonephritis with flank pain (no explicit fever)',
+        input={'age': 50, 'infection_type': 'uti', 'presentation': 'flank pain', 'crcl': 80},
+        expected_drugs=['Ceftriaxone'],
+        expected_route='IV'
+    ),
+)
 
 # 6-10: Pyelonephritis with mild PCN allergies
-TEST_CASES.extend([
-    {
-        'id': 6,
-        'name': 'Pyelonephritis + PCN rash only',
-        'input': {'age': 35, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin (rash)'},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 7,
-        'name': 'Pyelonephritis + PCN mild rash',
-        'input': {'age': 42, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin - mild rash'},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 8,
-        'name': 'Pyelonephritis + PCN itching',
-        'input': {'age': 28, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin (itching)'},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 9,
-        'name': 'Pyelonephritis + PCN rash + elderly',
-        'input': {'age': 78, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin - rash', 'crcl': 50},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 10,
-        'name': 'Pyelonephritis + PCN mild hives',
-        'input': {'age': 45, 'infection_type': 'uti', 'fever': True, 'allergies': 'PCN (mild hives)'},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-])
+_PYELO_MILD_PCN = (
+    Case(
+        id=6,
+        name='Pyelonephritis + PCN rash only',
+        input={'age': 35, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin (rash)'},
+        expected_drugs=['Ceftriaxone'],
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=7,
+        name='Pyelonephritis + PCN mild rash',
+        input={'age': 42, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin - mild rash'},
+        expected_drugs=['Ceftriaxone'],
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=8,
+        name='Pyelonephritis + PCN itching',
+        input={'age': 28, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin (itching)'},
+        expected_drugs=['Ceftriaxone'],
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=9,
+        name='Pyelonephritis + PCN rash + elderly',
+        input={'age': 78, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin - rash', 'crcl': 50},
+        expected_drugs=['Ceftriaxone'],
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=10,
+        name='Pyelonephritis + PCN mild hives',
+        input={'age': 45, 'infection_type': 'uti', 'fever': True, 'allergies': 'PCN (mild hives)'},
+        expected_drugs=['Ceftriaxone'],
+        expected_allergy='mild_pcn_allergy'
+    ),
+)
 
 # 11-15: Pyelonephritis with severe PCN allergies
-TEST_CASES.extend([
-    {
-        'id': 11,
-        'name': 'Pyelonephritis + PCN anaphylaxis',
-        'input': {'age': 55, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin (anaphylaxis)'},
-        'expected_drugs': ['Aztreonam'],  # Should NOT get cephalosporins
-        'expected_allergy': 'severe_pcn_allergy',
-        'forbidden_drugs': ['Ceftriaxone', 'Cefepime']
-    },
-    {
-        'id': 12,
-        'name': 'Pyelonephritis + PCN SJS',
-        'input': {'age': 40, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin - Stevens-Johnson syndrome'},
-        'expected_allergy': 'severe_pcn_allergy',
-        'forbidden_drugs': ['Ceftriaxone', 'Cefepime']
-    },
-    {
-        'id': 13,
-        'name': 'Pyelonephritis + PCN DRESS',
-        'input': {'age': 50, 'infection_type': 'uti', 'fever': True, 'allergies': 'PCN allergy (DRESS)'},
-        'expected_allergy': 'severe_pcn_allergy',
-        'forbidden_drugs': ['Ceftriaxone', 'Cefepime']
-    },
-    {
-        'id': 14,
-        'name': 'Pyelonephritis + PCN angioedema',
-        'input': {'age': 60, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin - angioedema'},
-        'expected_allergy': 'severe_pcn_allergy',
-        'forbidden_drugs': ['Ceftriaxone', 'Cefepime']
-    },
-    {
-        'id': 15,
-        'name': 'Pyelonephritis + PCN anaphylaxis + renal impairment',
-        'input': {'age': 70, 'infection_type': 'uti', 'fever': True, 'allergies': 'PCN (anaphylaxis)', 'crcl': 35},
-        'expected_allergy': 'severe_pcn_allergy',
-        'expect_warnings': True
-    },
-])
+_PYELO_SEVERE_PCN = (
+    Case(
+        id=11,
+        name='Pyelonephritis + PCN anaphylaxis',
+        input={'age': 55, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin (anaphylaxis)'},
+        expected_drugs=['Aztreonam'],  # Should NOT get cephalosporins
+        expected_allergy='severe_pcn_allergy',
+        forbidden_drugs=['Ceftriaxone', 'Cefepime']
+    ),
+    Case(
+        id=12,
+        name='Pyelonephritis + PCN SJS',
+        input={'age': 40, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin - Stevens-Johnson syndrome'},
+        expected_allergy='severe_pcn_allergy',
+        forbidden_drugs=['Ceftriaxone', 'Cefepime']
+    ),
+    Case(
+        id=13,
+        name='Pyelonephritis + PCN DRESS',
+        input={'age': 50, 'infection_type': 'uti', 'fever': True, 'allergies': 'PCN allergy (DRESS)'},
+        expected_allergy='severe_pcn_allergy',
+        forbidden_drugs=['Ceftriaxone', 'Cefepime']
+    ),
+    Case(
+        id=14,
+        name='Pyelonephritis + PCN angioedema',
+        input={'age': 60, 'infection_type': 'uti', 'fever': True, 'allergies': 'Penicillin - angioedema'},
+        expected_allergy='severe_pcn_allergy',
+        forbidden_drugs=['Ceftriaxone', 'Cefepime']
+    ),
+    Case(
+        id=15,
+        name='Pyelonephritis + PCN anaphylaxis + renal impairment',
+        input={'age': 70, 'infection_type': 'uti', 'fever': True, 'allergies': 'PCN (anaphylaxis)', 'crcl': 35},
+        expected_allergy='severe_pcn_allergy',
+        expect_warnings=True
+    ),
+)
 
 # 16-20: Pyelonephritis with pregnancy
-TEST_CASES.extend([
-    {
-        'id': 16,
-        'name': 'Pyelonephritis + 1st trimester pregnancy',
-        'input': {'age': 28, 'infection_type': 'uti', 'fever': True, 'pregnancy': 1},
-        'expected_drugs': ['Ceftriaxone'],  # Safe in pregnancy
-        'expected_route': 'IV'
-    },
-    {
-        'id': 17,
-        'name': 'Pyelonephritis + 2nd trimester pregnancy',
-        'input': {'age': 32, 'infection_type': 'uti', 'fever': True, 'pregnancy': 2},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_route': 'IV'
-    },
-    {
-        'id': 18,
-        'name': 'Pyelonephritis + 3rd trimester pregnancy',
-        'input': {'age': 25, 'infection_type': 'uti', 'fever': True, 'pregnancy': 3},
-        'expected_drugs': ['Ceftriaxone'],
-        'expected_route': 'IV'
-    },
-    {
-        'id': 19,
-        'name': 'Pyelonephritis + pregnancy + PCN rash',
-        'input': {'age': 30, 'infection_type': 'uti', 'fever': True, 'pregnancy': 2, 'allergies': 'Penicillin (rash)'},
-        'expected_drugs': ['Ceftriaxone'],  # Safe with mild allergy + pregnancy
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 20,
-        'name': 'Pyelonephritis + pregnancy + PCN anaphylaxis',
-        'input': {'age': 27, 'infection_type': 'uti', 'fever': True, 'pregnancy': 2, 'allergies': 'PCN - anaphylaxis'},
-        'expected_drugs': ['Aztreonam'],  # Safe for severe allergy + pregnancy
-        'expected_allergy': 'severe_pcn_allergy'
-    },
-])
+_PYELO_PREGNANCY = (
+    Case(
+        id=16,
+        name='Pyelonephritis + 1st trimester pregnancy',
+        input={'age': 28, 'infection_type': 'uti', 'fever': True, 'pregnancy': 1},
+        expected_drugs=['Ceftriaxone'],  # Safe in pregnancy
+        expected_route='IV'
+    ),
+    Case(
+        id=17,
+        name='Pyelonephritis + 2nd trimester pregnancy',
+        input={'age': 32, 'infection_type': 'uti', 'fever': True, 'pregnancy': 2},
+        expected_drugs=['Ceftriaxone'],
+        expected_route='IV'
+    ),
+    Case(
+        id=18,
+        name='Pyelonephritis + 3rd trimester pregnancy',
+        input={'age': 25, 'infection_type': 'uti', 'fever': True, 'pregnancy': 3},
+        expected_drugs=['Ceftriaxone'],
+        expected_route='IV'
+    ),
+    Case(
+        id=19,
+        name='Pyelonephritis + pregnancy + PCN rash',
+        input={'age': 30, 'infection_type': 'uti', 'fever': True, 'pregnancy': 2, 'allergies': 'Penicillin (rash)'},
+        expected_drugs=['Ceftriaxone'],  # Safe with mild allergy + pregnancy
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=20,
+        name='Pyelonephritis + pregnancy + PCN anaphylaxis',
+        input={'age': 27, 'infection_type': 'uti', 'fever': True, 'pregnancy': 2, 'allergies': 'PCN - anaphylaxis'},
+        expected_drugs=['Aztreonam'],  # Safe for severe allergy + pregnancy
+        expected_allergy='severe_pcn_allergy'
+    ),
+)
 
 # =============================================================================
 # SECTION 2: INTRA-ABDOMINAL INFECTIONS (20 cases)
 # =============================================================================
 
 # 21-25: Basic intra-abdominal
-TEST_CASES.extend([
-    {
-        'id': 21,
-        'name': 'Moderate intra-abdominal, no allergies',
-        'input': {'age': 55, 'infection_type': 'intra_abdominal', 'severity': 'moderate'},
-        'expected_drugs_contains': ['Piperacillin_tazobactam', 'Metronidazole'],
-        'expected_route': 'IV'
-    },
-    {
-        'id': 22,
-        'name': 'Severe intra-abdominal, ICU',
-        'input': {'age': 60, 'infection_type': 'intra_abdominal', 'severity': 'severe', 'location': 'ICU'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 23,
-        'name': 'Intra-abdominal post-surgery',
-        'input': {'age': 45, 'infection_type': 'intra_abdominal', 'source_risk': 'post-surgical'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 24,
-        'name': 'Intra-abdominal elderly + renal impairment',
-        'input': {'age': 80, 'infection_type': 'intra_abdominal', 'crcl': 30},
-        'expected_route': 'IV',
-        'expect_warnings': True
-    },
-    {
-        'id': 25,
-        'name': 'Intra-abdominal + peritonitis',
-        'input': {'age': 50, 'infection_type': 'intra_abdominal', 'presentation': 'peritonitis'},
-        'expected_route': 'IV'
-    },
-])
+_INTRA_ABD_BASIC = (
+    Case(
+        id=21,
+        name='Moderate intra-abdominal, no allergies',
+        input={'age': 55, 'infection_type': 'intra_abdominal', 'severity': 'moderate'},
+        expected_drugs_contains=['Piperacillin_tazobactam', 'Metronidazole'],
+        expected_route='IV'
+    ),
+    Case(
+        id=22,
+        name='Severe intra-abdominal, ICU',
+        input={'age': 60, 'infection_type': 'intra_abdominal', 'severity': 'severe', 'location': 'ICU'},
+        expected_route='IV'
+    ),
+    Case(
+        id=23,
+        name='Intra-abdominal post-surgery',
+        input={'age': 45, 'infection_type': 'intra_abdominal', 'source_risk': 'post-surgical'},
+        expected_route='IV'
+    ),
+    Case(
+        id=24,
+        name='Intra-abdominal elderly + renal impairment',
+        input={'age': 80, 'infection_type': 'intra_abdominal', 'crcl': 30},
+        expected_route='IV',
+        expect_warnings=True
+    ),
+    Case(
+        id=25,
+        name='Intra-abdominal + peritonitis',
+        input={'age': 50, 'infection_type': 'intra_abdominal', 'presentation': 'peritonitis'},
+        expected_route='IV'
+    ),
+)
 
 # 26-30: Intra-abdominal with mild PCN allergy
-TEST_CASES.extend([
-    {
-        'id': 26,
-        'name': 'Intra-abdominal + PCN rash',
-        'input': {'age': 55, 'infection_type': 'intra_abdominal', 'allergies': 'Penicillin (rash)'},
-        'expected_drugs_contains': ['Piperacillin_tazobactam', 'Metronidazole'],  # Can use pip-tazo with mild allergy
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 27,
-        'name': 'Intra-abdominal + PCN mild rash + elderly',
-        'input': {'age': 75, 'infection_type': 'intra_abdominal', 'allergies': 'PCN - rash only', 'crcl': 45},
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 28,
-        'name': 'Intra-abdominal + PCN itching',
-        'input': {'age': 48, 'infection_type': 'intra_abdominal', 'allergies': 'Penicillin (itching)'},
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 29,
-        'name': 'Intra-abdominal + PCN rash + post-op',
-        'input': {'age': 62, 'infection_type': 'intra_abdominal', 'allergies': 'PCN rash', 'source_risk': 'Recent surgery'},
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 30,
-        'name': 'Intra-abdominal + PCN mild hives',
-        'input': {'age': 40, 'infection_type': 'intra_abdominal', 'allergies': 'Penicillin - mild hives'},
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-])
+_INTRA_ABD_MILD_PCN = (
+    Case(
+        id=26,
+        name='Intra-abdominal + PCN rash',
+        input={'age': 55, 'infection_type': 'intra_abdominal', 'allergies': 'Penicillin (rash)'},
+        expected_drugs_contains=['Piperacillin_tazobactam', 'Metronidazole'],  # Can use pip-tazo with mild allergy
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=27,
+        name='Intra-abdominal + PCN mild rash + elderly',
+        input={'age': 75, 'infection_type': 'intra_abdominal', 'allergies': 'PCN - rash only', 'crcl': 45},
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=28,
+        name='Intra-abdominal + PCN itching',
+        input={'age': 48, 'infection_type': 'intra_abdominal', 'allergies': 'Penicillin (itching)'},
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=29,
+        name='Intra-abdominal + PCN rash + post-op',
+        input={'age': 62, 'infection_type': 'intra_abdominal', 'allergies': 'PCN rash', 'source_risk': 'Recent surgery'},
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=30,
+        name='Intra-abdominal + PCN mild hives',
+        input={'age': 40, 'infection_type': 'intra_abdominal', 'allergies': 'Penicillin - mild hives'},
+        expected_allergy='mild_pcn_allergy'
+    ),
+)
 
 # 31-35: Intra-abdominal with severe PCN allergy
-TEST_CASES.extend([
-    {
-        'id': 31,
-        'name': 'Intra-abdominal + PCN anaphylaxis',
-        'input': {'age': 55, 'infection_type': 'intra_abdominal', 'allergies': 'Penicillin (anaphylaxis)', 'weight': 70},
-        'expected_drugs_contains': ['Aztreonam', 'Metronidazole', 'Vancomycin'],
-        'expected_allergy': 'severe_pcn_allergy',
-        'forbidden_drugs': ['Piperacillin', 'Ceftriaxone', 'Cefepime']
-    },
-    {
-        'id': 32,
-        'name': 'Intra-abdominal + PCN SJS',
-        'input': {'age': 48, 'infection_type': 'intra_abdominal', 'allergies': 'PCN - SJS', 'weight': 80},
-        'expected_allergy': 'severe_pcn_allergy',
-        'forbidden_drugs': ['Piperacillin', 'Ceftriaxone']
-    },
-    {
-        'id': 33,
-        'name': 'Intra-abdominal + PCN anaphylaxis + renal impairment',
-        'input': {'age': 70, 'infection_type': 'intra_abdominal', 'allergies': 'PCN anaphylaxis', 'crcl': 35, 'weight': 65},
-        'expected_allergy': 'severe_pcn_allergy',
-        'expect_warnings': True
-    },
-    {
-        'id': 34,
-        'name': 'Intra-abdominal + PCN DRESS + post-op',
-        'input': {'age': 55, 'infection_type': 'intra_abdominal', 'allergies': 'Penicillin DRESS', 'source_risk': 'post-surgical'},
-        'expected_allergy': 'severe_pcn_allergy'
-    },
-    {
-        'id': 35,
-        'name': 'Intra-abdominal + PCN angioedema + severe',
-        'input': {'age': 60, 'infection_type': 'intra_abdominal', 'allergies': 'PCN - angioedema', 'severity': 'severe'},
-        'expected_allergy': 'severe_pcn_allergy'
-    },
-])
+_INTRA_ABD_SEVERE_PCN = (
+    Case(
+        id=31,
+        name='Intra-abdominal + PCN anaphylaxis',
+        input={'age': 55, 'infection_type': 'intra_abdominal', 'allergies': 'Penicillin (anaphylaxis)', 'weight': 70},
+        expected_drugs_contains=['Aztreonam', 'Metronidazole', 'Vancomycin'],
+        expected_allergy='severe_pcn_allergy',
+        forbidden_drugs=['Piperacillin', 'Ceftriaxone', 'Cefepime']
+    ),
+    Case(
+        id=32,
+        name='Intra-abdominal + PCN SJS',
+        input={'age': 48, 'infection_type': 'intra_abdominal', 'allergies': 'PCN - SJS', 'weight': 80},
+        expected_allergy='severe_pcn_allergy',
+        forbidden_drugs=['Piperacillin', 'Ceftriaxone']
+    ),
+    Case(
+        id=33,
+        name='Intra-abdominal + PCN anaphylaxis + renal impairment',
+        input={'age': 70, 'infection_type': 'intra_abdominal', 'allergies': 'PCN anaphylaxis', 'crcl': 35, 'weight': 65},
+        expected_allergy='severe_pcn_allergy',
+        expect_warnings=True
+    ),
+    Case(
+        id=34,
+        name='Intra-abdominal + PCN DRESS + post-op',
+        input={'age': 55, 'infection_type': 'intra_abdominal', 'allergies': 'Penicillin DRESS', 'source_risk': 'post-surgical'},
+        expected_allergy='severe_pcn_allergy'
+    ),
+    Case(
+        id=35,
+        name='Intra-abdominal + PCN angioedema + severe',
+        input={'age': 60, 'infection_type': 'intra_abdominal', 'allergies': 'PCN - angioedema', 'severity': 'severe'},
+        expected_allergy='severe_pcn_allergy'
+    ),
+)
 
 # 36-40: Intra-abdominal complex cases
-TEST_CASES.extend([
-    {
-        'id': 36,
-        'name': 'Intra-abdominal + abscess',
-        'input': {'age': 52, 'infection_type': 'intra_abdominal', 'presentation': 'abscess'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 37,
-        'name': 'Intra-abdominal + perforation',
-        'input': {'age': 45, 'infection_type': 'intra_abdominal', 'source_risk': 'bowel perforation'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 38,
-        'name': 'Intra-abdominal + appendicitis',
-        'input': {'age': 28, 'infection_type': 'intra_abdominal', 'presentation': 'ruptured appendix'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 39,
-        'name': 'Intra-abdominal + diverticulitis',
-        'input': {'age': 65, 'infection_type': 'intra_abdominal', 'presentation': 'diverticulitis'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 40,
-        'name': 'Intra-abdominal + cholecystitis',
-        'input': {'age': 58, 'infection_type': 'intra_abdominal', 'presentation': 'cholecystitis'},
-        'expected_route': 'IV'
-    },
-])
+_INTRA_ABD_COMPLEX = (
+    Case(
+        id=36,
+        name='Intra-abdominal + abscess',
+        input={'age': 52, 'infection_type': 'intra_abdominal', 'presentation': 'abscess'},
+        expected_route='IV'
+    ),
+    Case(
+        id=37,
+        name='Intra-abdominal + perforation',
+        input={'age': 45, 'infection_type': 'intra_abdominal', 'source_risk': 'bowel perforation'},
+        expected_route='IV'
+    ),
+    Case(
+        id=38,
+        name='Intra-abdominal + appendicitis',
+        input={'age': 28, 'infection_type': 'intra_abdominal', 'presentation': 'ruptured appendix'},
+        expected_route='IV'
+    ),
+    Case(
+        id=39,
+        name='Intra-abdominal + diverticulitis',
+        input={'age': 65, 'infection_type': 'intra_abdominal', 'presentation': 'diverticulitis'},
+        expected_route='IV'
+    ),
+    Case(
+        id=40,
+        name='Intra-abdominal + cholecystitis',
+        input={'age': 58, 'infection_type': 'intra_abdominal', 'presentation': 'cholecystitis'},
+        expected_route='IV'
+    ),
+)
 
 # =============================================================================
 # SECTION 3: BACTEREMIA / SEPSIS (20 cases)
 # =============================================================================
 
 # 41-45: Basic bacteremia
-TEST_CASES.extend([
-    {
-        'id': 41,
-        'name': 'Bacteremia, no MRSA risk',
-        'input': {'age': 55, 'infection_type': 'bacteremia', 'mrsa_risk': False},
-        'expected_drugs_contains': ['Ceftriaxone'],
-        'expected_route': 'IV'
-    },
-    {
-        'id': 42,
-        'name': 'Bacteremia with MRSA risk',
-        'input': {'age': 60, 'infection_type': 'bacteremia', 'mrsa_risk': True, 'weight': 70},
-        'expected_drugs_contains': ['Vancomycin'],
-        'expected_route': 'IV'
-    },
-    {
-        'id': 43,
-        'name': 'Bacteremia + MRSA colonization',
-        'input': {'age': 75, 'infection_type': 'bacteremia', 'inf_risks': 'MRSA colonization', 'weight': 65},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 44,
-        'name': 'Bacteremia + central line',
-        'input': {'age': 50, 'infection_type': 'bacteremia', 'source_risk': 'central line', 'weight': 80},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 45,
-        'name': 'Sepsis + shock',
-        'input': {'age': 65, 'infection_type': 'bacteremia', 'severity': 'severe', 'presentation': 'septic shock', 'weight': 70},
-        'expected_route': 'IV',
-        'expect_warnings': True
-    },
-])
+_BACTEREMIA_BASIC = (
+    Case(
+        id=41,
+        name='Bacteremia, no MRSA risk',
+        input={'age': 55, 'infection_type': 'bacteremia', 'mrsa_risk': False},
+        expected_drugs_contains=['Ceftriaxone'],
+        expected_route='IV'
+    ),
+    Case(
+        id=42,
+        name='Bacteremia with MRSA risk',
+        input={'age': 60, 'infection_type': 'bacteremia', 'mrsa_risk': True, 'weight': 70},
+        expected_drugs_contains=['Vancomycin'],
+        expected_route='IV'
+    ),
+    Case(
+        id=43,
+        name='Bacteremia + MRSA colonization',
+        input={'age': 75, 'infection_type': 'bacteremia', 'inf_risks': 'MRSA colonization', 'weight': 65},
+        expected_route='IV'
+    ),
+    Case(
+        id=44,
+        name='Bacteremia + central line',
+        input={'age': 50, 'infection_type': 'bacteremia', 'source_risk': 'central line', 'weight': 80},
+        expected_route='IV'
+    ),
+    Case(
+        id=45,
+        name='Sepsis + shock',
+        input={'age': 65, 'infection_type': 'bacteremia', 'severity': 'severe', 'presentation': 'septic shock', 'weight': 70},
+        expected_route='IV',
+        expect_warnings=True
+    ),
+)
 
 # 46-50: Bacteremia with PCN allergies
-TEST_CASES.extend([
-    {
-        'id': 46,
-        'name': 'Bacteremia + PCN rash',
-        'input': {'age': 55, 'infection_type': 'bacteremia', 'allergies': 'Penicillin (rash)'},
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 47,
-        'name': 'Bacteremia + PCN anaphylaxis (no MRSA)',
-        'input': {'age': 50, 'infection_type': 'bacteremia', 'allergies': 'PCN - anaphylaxis', 'mrsa_risk': False},
-        'expected_drugs_contains': ['Aztreonam'],
-        'expected_allergy': 'severe_pcn_allergy',
-        'forbidden_drugs': ['Ceftriaxone', 'Cefepime']
-    },
-    {
-        'id': 48,
-        'name': 'Bacteremia MRSA + PCN anaphylaxis',
-        'input': {'age': 88, 'infection_type': 'bacteremia', 'allergies': 'Penicillin (anaphylaxis)', 'mrsa_risk': True, 'weight': 70},
-        'expected_drugs_contains': ['Aztreonam', 'Vancomycin'],
-        'expected_allergy': 'severe_pcn_allergy',
-        'forbidden_drugs': ['Ceftriaxone', 'Cefepime']
-    },
-    {
-        'id': 49,
-        'name': 'Bacteremia + PCN SJS + MRSA',
-        'input': {'age': 72, 'infection_type': 'bacteremia', 'allergies': 'PCN allergy (SJS)', 'inf_risks': 'MRSA colonization', 'weight': 65},
-        'expected_allergy': 'severe_pcn_allergy'
-    },
-    {
-        'id': 50,
-        'name': 'Bacteremia + PCN anaphylaxis + renal failure',
-        'input': {'age': 80, 'infection_type': 'bacteremia', 'allergies': 'PCN (anaphylaxis)', 'crcl': 20, 'weight': 60},
-        'expected_allergy': 'severe_pcn_allergy',
-        'expect_warnings': True
-    },
-])
+_BACTEREMIA_PCN = (
+    Case(
+        id=46,
+        name='Bacteremia + PCN rash',
+        input={'age': 55, 'infection_type': 'bacteremia', 'allergies': 'Penicillin (rash)'},
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=47,
+        name='Bacteremia + PCN anaphylaxis (no MRSA)',
+        input={'age': 50, 'infection_type': 'bacteremia', 'allergies': 'PCN - anaphylaxis', 'mrsa_risk': False},
+        expected_drugs_contains=['Aztreonam'],
+        expected_allergy='severe_pcn_allergy',
+        forbidden_drugs=['Ceftriaxone', 'Cefepime']
+    ),
+    Case(
+        id=48,
+        name='Bacteremia MRSA + PCN anaphylaxis',
+        input={'age': 88, 'infection_type': 'bacteremia', 'allergies': 'Penicillin (anaphylaxis)', 'mrsa_risk': True, 'weight': 70},
+        expected_drugs_contains=['Aztreonam', 'Vancomycin'],
+        expected_allergy='severe_pcn_allergy',
+        forbidden_drugs=['Ceftriaxone', 'Cefepime']
+    ),
+    Case(
+        id=49,
+        name='Bacteremia + PCN SJS + MRSA',
+        input={'age': 72, 'infection_type': 'bacteremia', 'allergies': 'PCN allergy (SJS)', 'inf_risks': 'MRSA colonization', 'weight': 65},
+        expected_allergy='severe_pcn_allergy'
+    ),
+    Case(
+        id=50,
+        name='Bacteremia + PCN anaphylaxis + renal failure',
+        input={'age': 80, 'infection_type': 'bacteremia', 'allergies': 'PCN (anaphylaxis)', 'crcl': 20, 'weight': 60},
+        expected_allergy='severe_pcn_allergy',
+        expect_warnings=True
+    ),
+)
 
 # 51-60: Bacteremia complex scenarios
-TEST_CASES.extend([
-    {
-        'id': 51,
-        'name': 'Bacteremia + endocarditis risk',
-        'input': {'age': 55, 'infection_type': 'bacteremia', 'source_risk': 'endocarditis', 'weight': 75},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 52,
-        'name': 'Bacteremia + neutropenia',
-        'input': {'age': 45, 'infection_type': 'bacteremia', 'inf_risks': 'neutropenia', 'weight': 70},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 53,
-        'name': 'Bacteremia + immunosuppressed',
-        'input': {'age': 50, 'infection_type': 'bacteremia', 'inf_risks': 'immunosuppressed', 'weight': 68},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 54,
-        'name': 'Bacteremia + recent hospitalization',
-        'input': {'age': 70, 'infection_type': 'bacteremia', 'source_risk': 'recent hospitalization'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 55,
-        'name': 'Bacteremia + dialysis catheter',
-        'input': {'age': 65, 'infection_type': 'bacteremia', 'source_risk': 'dialysis catheter', 'crcl': 10, 'weight': 70},
-        'expect_warnings': True
-    },
-    {
-        'id': 56,
-        'name': 'Bacteremia + bone marrow transplant',
-        'input': {'age': 40, 'infection_type': 'bacteremia', 'inf_risks': 'bone marrow transplant', 'weight': 65},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 57,
-        'name': 'Bacteremia + liver cirrhosis',
-        'input': {'age': 60, 'infection_type': 'bacteremia', 'inf_risks': 'cirrhosis'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 58,
-        'name': 'Bacteremia + HIV',
-        'input': {'age': 42, 'infection_type': 'bacteremia', 'inf_risks': 'HIV'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 59,
-        'name': 'Bacteremia + diabetes',
-        'input': {'age': 58, 'infection_type': 'bacteremia', 'inf_risks': 'diabetes mellitus'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 60,
-        'name': 'Bacteremia + ESRD on dialysis',
-        'input': {'age': 70, 'infection_type': 'bacteremia', 'inf_risks': 'ESRD on hemodialysis', 'crcl': 5, 'weight': 75},
-        'expect_warnings': True
-    },
-])
+_BACTEREMIA_COMPLEX = (
+    Case(
+        id=51,
+        name='Bacteremia + endocarditis risk',
+        input={'age': 55, 'infection_type': 'bacteremia', 'source_risk': 'endocarditis', 'weight': 75},
+        expected_route='IV'
+    ),
+    Case(
+        id=52,
+        name='Bacteremia + neutropenia',
+        input={'age': 45, 'infection_type': 'bacteremia', 'inf_risks': 'neutropenia', 'weight': 70},
+        expected_route='IV'
+    ),
+    Case(
+        id=53,
+        name='Bacteremia + immunosuppressed',
+        input={'age': 50, 'infection_type': 'bacteremia', 'inf_risks': 'immunosuppressed', 'weight': 68},
+        expected_route='IV'
+    ),
+    Case(
+        id=54,
+        name='Bacteremia + recent hospitalization',
+        input={'age': 70, 'infection_type': 'bacteremia', 'source_risk': 'recent hospitalization'},
+        expected_route='IV'
+    ),
+    Case(
+        id=55,
+        name='Bacteremia + dialysis catheter',
+        input={'age': 65, 'infection_type': 'bacteremia', 'source_risk': 'dialysis catheter', 'crcl': 10, 'weight': 70},
+        expect_warnings=True
+    ),
+    Case(
+        id=56,
+        name='Bacteremia + bone marrow transplant',
+        input={'age': 40, 'infection_type': 'bacteremia', 'inf_risks': 'bone marrow transplant', 'weight': 65},
+        expected_route='IV'
+    ),
+    Case(
+        id=57,
+        name='Bacteremia + liver cirrhosis',
+        input={'age': 60, 'infection_type': 'bacteremia', 'inf_risks': 'cirrhosis'},
+        expected_route='IV'
+    ),
+    Case(
+        id=58,
+        name='Bacteremia + HIV',
+        input={'age': 42, 'infection_type': 'bacteremia', 'inf_risks': 'HIV'},
+        expected_route='IV'
+    ),
+    Case(
+        id=59,
+        name='Bacteremia + diabetes',
+        input={'age': 58, 'infection_type': 'bacteremia', 'inf_risks': 'diabetes mellitus'},
+        expected_route='IV'
+    ),
+    Case(
+        id=60,
+        name='Bacteremia + ESRD on dialysis',
+        input={'age': 70, 'infection_type': 'bacteremia', 'inf_risks': 'ESRD on hemodialysis', 'crcl': 5, 'weight': 75},
+        expect_warnings=True
+    ),
+)
 
 # =============================================================================
 # SECTION 4: PNEUMONIA (15 cases)
 # =============================================================================
 
 # 61-75: Pneumonia variations
-TEST_CASES.extend([
-    {
-        'id': 61,
-        'name': 'CAP, healthy adult',
-        'input': {'age': 45, 'infection_type': 'pneumonia', 'location': 'community'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 62,
-        'name': 'CAP, elderly',
-        'input': {'age': 78, 'infection_type': 'pneumonia', 'location': 'community', 'crcl': 50},
-        'expected_route': 'IV',
-        'expect_warnings': True
-    },
-    {
-        'id': 63,
-        'name': 'Severe CAP, ICU',
-        'input': {'age': 55, 'infection_type': 'pneumonia', 'location': 'ICU', 'severity': 'severe'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 64,
-        'name': 'HAP (hospital-acquired)',
-        'input': {'age': 60, 'infection_type': 'pneumonia', 'location': 'hospital'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 65,
-        'name': 'VAP (ventilator-associated)',
-        'input': {'age': 65, 'infection_type': 'pneumonia', 'location': 'ventilator', 'source_risk': 'mechanical ventilation'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 66,
-        'name': 'Aspiration pneumonia',
-        'input': {'age': 75, 'infection_type': 'pneumonia', 'presentation': 'aspiration'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 67,
-        'name': 'Pneumonia + PCN rash',
-        'input': {'age': 50, 'infection_type': 'pneumonia', 'allergies': 'Penicillin (rash)'},
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 68,
-        'name': 'Pneumonia + PCN anaphylaxis',
-        'input': {'age': 55, 'infection_type': 'pneumonia', 'allergies': 'PCN - anaphylaxis'},
-        'expected_allergy': 'severe_pcn_allergy'
-    },
-    {
-        'id': 69,
-        'name': 'Pneumonia + COPD',
-        'input': {'age': 68, 'infection_type': 'pneumonia', 'inf_risks': 'COPD'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 70,
-        'name': 'Pneumonia + pregnancy',
-        'input': {'age': 30, 'infection_type': 'pneumonia', 'pregnancy': 2},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 71,
-        'name': 'Pneumonia + nursing home resident',
-        'input': {'age': 82, 'infection_type': 'pneumonia', 'source_risk': 'nursing home'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 72,
-        'name': 'Pneumonia + recent antibiotic use',
-        'input': {'age': 55, 'infection_type': 'pneumonia', 'prior_resistance': 'recent azithromycin use'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 73,
-        'name': 'Pneumonia + immunocompromised',
-        'input': {'age': 45, 'infection_type': 'pneumonia', 'inf_risks': 'immunosuppressed'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 74,
-        'name': 'Pneumonia + empyema',
-        'input': {'age': 58, 'infection_type': 'pneumonia', 'presentation': 'empyema'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 75,
-        'name': 'Pneumonia + bacteremia',
-        'input': {'age': 70, 'infection_type': 'pneumonia', 'inf_risks': 'bacteremic'},
-        'expected_route': 'IV'
-    },
-])
+_PNEUMONIA = (
+    Case(
+        id=61,
+        name='CAP, healthy adult',
+        input={'age': 45, 'infection_type': 'pneumonia', 'location': 'community'},
+        expected_route='IV'
+    ),
+    Case(
+        id=62,
+        name='CAP, elderly',
+        input={'age': 78, 'infection_type': 'pneumonia', 'location': 'community', 'crcl': 50},
+        expected_route='IV',
+        expect_warnings=True
+    ),
+    Case(
+        id=63,
+        name='Severe CAP, ICU',
+        input={'age': 55, 'infection_type': 'pneumonia', 'location': 'ICU', 'severity': 'severe'},
+        expected_route='IV'
+    ),
+    Case(
+        id=64,
+        name='HAP (hospital-acquired)',
+        input={'age': 60, 'infection_type': 'pneumonia', 'location': 'hospital'},
+        expected_route='IV'
+    ),
+    Case(
+        id=65,
+        name='VAP (ventilator-associated)',
+        input={'age': 65, 'infection_type': 'pneumonia', 'location': 'ventilator', 'source_risk': 'mechanical ventilation'},
+        expected_route='IV'
+    ),
+    Case(
+        id=66,
+        name='Aspiration pneumonia',
+        input={'age': 75, 'infection_type': 'pneumonia', 'presentation': 'aspiration'},
+        expected_route='IV'
+    ),
+    Case(
+        id=67,
+        name='Pneumonia + PCN rash',
+        input={'age': 50, 'infection_type': 'pneumonia', 'allergies': 'Penicillin (rash)'},
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=68,
+        name='Pneumonia + PCN anaphylaxis',
+        input={'age': 55, 'infection_type': 'pneumonia', 'allergies': 'PCN - anaphylaxis'},
+        expected_allergy='severe_pcn_allergy'
+    ),
+    Case(
+        id=69,
+        name='Pneumonia + COPD',
+        input={'age': 68, 'infection_type': 'pneumonia', 'inf_risks': 'COPD'},
+        expected_route='IV'
+    ),
+    Case(
+        id=70,
+        name='Pneumonia + pregnancy',
+        input={'age': 30, 'infection_type': 'pneumonia', 'pregnancy': 2},
+        expected_route='IV'
+    ),
+    Case(
+        id=71,
+        name='Pneumonia + nursing home resident',
+        input={'age': 82, 'infection_type': 'pneumonia', 'source_risk': 'nursing home'},
+        expected_route='IV'
+    ),
+    Case(
+        id=72,
+        name='Pneumonia + recent antibiotic use',
+        input={'age': 55, 'infection_type': 'pneumonia', 'prior_resistance': 'recent azithromycin use'},
+        expected_route='IV'
+    ),
+    Case(
+        id=73,
+        name='Pneumonia + immunocompromised',
+        input={'age': 45, 'infection_type': 'pneumonia', 'inf_risks': 'immunosuppressed'},
+        expected_route='IV'
+    ),
+    Case(
+        id=74,
+        name='Pneumonia + empyema',
+        input={'age': 58, 'infection_type': 'pneumonia', 'presentation': 'empyema'},
+        expected_route='IV'
+    ),
+    Case(
+        id=75,
+        name='Pneumonia + bacteremia',
+        input={'age': 70, 'infection_type': 'pneumonia', 'inf_risks': 'bacteremic'},
+        expected_route='IV'
+    ),
+)
 
 # =============================================================================
 # SECTION 5: MENINGITIS (10 cases)
 # =============================================================================
 
 # 76-85: Meningitis variations
-TEST_CASES.extend([
-    {
-        'id': 76,
-        'name': 'Bacterial meningitis, young adult',
-        'input': {'age': 25, 'infection_type': 'meningitis', 'weight': 70},
-        'expected_drugs_contains': ['Ceftriaxone', 'Vancomycin'],
-        'expected_route': 'IV'
-    },
-    {
-        'id': 77,
-        'name': 'Meningitis, elderly',
-        'input': {'age': 75, 'infection_type': 'meningitis', 'weight': 65, 'crcl': 40},
-        'expected_route': 'IV',
-        'expect_warnings': True
-    },
-    {
-        'id': 78,
-        'name': 'Meningitis + PCN rash',
-        'input': {'age': 45, 'infection_type': 'meningitis', 'allergies': 'Penicillin (rash)', 'weight': 75},
-        'expected_allergy': 'mild_pcn_allergy'
-    },
-    {
-        'id': 79,
-        'name': 'Meningitis + PCN anaphylaxis',
-        'input': {'age': 50, 'infection_type': 'meningitis', 'allergies': 'PCN anaphylaxis', 'weight': 70},
-        'expected_allergy': 'severe_pcn_allergy'
-    },
-    {
-        'id': 80,
-        'name': 'Meningitis + renal impairment',
-        'input': {'age': 60, 'infection_type': 'meningitis', 'crcl': 30, 'weight': 68},
-        'expect_warnings': True
-    },
-    {
-        'id': 81,
-        'name': 'Post-neurosurgical meningitis',
-        'input': {'age': 55, 'infection_type': 'meningitis', 'source_risk': 'post-neurosurgery', 'weight': 80},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 82,
-        'name': 'Meningitis + CSF shunt',
-        'input': {'age': 40, 'infection_type': 'meningitis', 'source_risk': 'VP shunt', 'weight': 70},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 83,
-        'name': 'Meningitis + immunocompromised',
-        'input': {'age': 35, 'infection_type': 'meningitis', 'inf_risks': 'HIV', 'weight': 65},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 84,
-        'name': 'Meningitis + head trauma',
-        'input': {'age': 30, 'infection_type': 'meningitis', 'source_risk': 'basilar skull fracture', 'weight': 75},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 85,
-        'name': 'Meningitis + severe renal failure',
-        'input': {'age': 70, 'infection_type': 'meningitis', 'crcl': 15, 'weight': 60},
-        'expect_warnings': True
-    },
-])
+_MENINGITIS = (
+    Case(
+        id=76,
+        name='Bacterial meningitis, young adult',
+        input={'age': 25, 'infection_type': 'meningitis', 'weight': 70},
+        expected_drugs_contains=['Ceftriaxone', 'Vancomycin'],
+        expected_route='IV'
+    ),
+    Case(
+        id=77,
+        name='Meningitis, elderly',
+        input={'age': 75, 'infection_type': 'meningitis', 'weight': 65, 'crcl': 40},
+        expected_route='IV',
+        expect_warnings=True
+    ),
+    Case(
+        id=78,
+        name='Meningitis + PCN rash',
+        input={'age': 45, 'infection_type': 'meningitis', 'allergies': 'Penicillin (rash)', 'weight': 75},
+        expected_allergy='mild_pcn_allergy'
+    ),
+    Case(
+        id=79,
+        name='Meningitis + PCN anaphylaxis',
+        input={'age': 50, 'infection_type': 'meningitis', 'allergies': 'PCN anaphylaxis', 'weight': 70},
+        expected_allergy='severe_pcn_allergy'
+    ),
+    Case(
+        id=80,
+        name='Meningitis + renal impairment',
+        input={'age': 60, 'infection_type': 'meningitis', 'crcl': 30, 'weight': 68},
+        expect_warnings=True
+    ),
+    Case(
+        id=81,
+        name='Post-neurosurgical meningitis',
+        input={'age': 55, 'infection_type': 'meningitis', 'source_risk': 'post-neurosurgery', 'weight': 80},
+        expected_route='IV'
+    ),
+    Case(
+        id=82,
+        name='Meningitis + CSF shunt',
+        input={'age': 40, 'infection_type': 'meningitis', 'source_risk': 'VP shunt', 'weight': 70},
+        expected_route='IV'
+    ),
+    Case(
+        id=83,
+        name='Meningitis + immunocompromised',
+        input={'age': 35, 'infection_type': 'meningitis', 'inf_risks': 'HIV', 'weight': 65},
+        expected_route='IV'
+    ),
+    Case(
+        id=84,
+        name='Meningitis + head trauma',
+        input={'age': 30, 'infection_type': 'meningitis', 'source_risk': 'basilar skull fracture', 'weight': 75},
+        expected_route='IV'
+    ),
+    Case(
+        id=85,
+        name='Meningitis + severe renal failure',
+        input={'age': 70, 'infection_type': 'meningitis', 'crcl': 15, 'weight': 60},
+        expect_warnings=True
+    ),
+)
 
 # =============================================================================
 # SECTION 6: EDGE CASES & COMBINATIONS (15 cases)
 # =============================================================================
 
 # 86-100: Edge cases and unusual combinations
-TEST_CASES.extend([
-    {
-        'id': 86,
-        'name': 'Very elderly (95yo) + multiple comorbidities',
-        'input': {'age': 95, 'infection_type': 'uti', 'fever': True, 'crcl': 25, 'inf_risks': 'dementia, CHF'},
-        'expect_warnings': True
-    },
-    {
-        'id': 87,
-        'name': 'Young adult (18yo) + no risk factors',
-        'input': {'age': 18, 'infection_type': 'uti', 'fever': True, 'crcl': 100},
-        'expected_drugs': ['Ceftriaxone']
-    },
-    {
-        'id': 88,
-        'name': 'Pregnancy + PCN anaphylaxis + pyelonephritis',
-        'input': {'age': 28, 'infection_type': 'uti', 'fever': True, 'pregnancy': 2, 'allergies': 'PCN (anaphylaxis)'},
-        'expected_drugs': ['Aztreonam'],  # Safe for both pregnancy and severe allergy
-        'expected_allergy': 'severe_pcn_allergy'
-    },
-    {
-        'id': 89,
-        'name': 'ESRD on dialysis + intra-abdominal',
-        'input': {'age': 55, 'infection_type': 'intra_abdominal', 'crcl': 5, 'inf_risks': 'hemodialysis', 'weight': 70},
-        'expect_warnings': True
-    },
-    {
-        'id': 90,
-        'name': 'Liver cirrhosis + ascites + peritonitis',
-        'input': {'age': 58, 'infection_type': 'intra_abdominal', 'inf_risks': 'cirrhosis', 'presentation': 'SBP'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 91,
-        'name': 'Neutropenic fever',
-        'input': {'age': 45, 'infection_type': 'bacteremia', 'inf_risks': 'neutropenia ANC <500', 'weight': 65},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 92,
-        'name': 'Splenectomy + bacteremia',
-        'input': {'age': 50, 'infection_type': 'bacteremia', 'source_risk': 'asplenia', 'weight': 70},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 93,
-        'name': 'Cystic fibrosis + pneumonia',
-        'input': {'age': 28, 'infection_type': 'pneumonia', 'inf_risks': 'cystic fibrosis'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 94,
-        'name': 'Post-transplant + multiple allergies',
-        'input': {'age': 55, 'infection_type': 'bacteremia', 'inf_risks': 'kidney transplant', 'allergies': 'PCN (rash), sulfa (rash)', 'weight': 75},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 95,
-        'name': 'Morbid obesity + intra-abdominal',
-        'input': {'age': 50, 'infection_type': 'intra_abdominal', 'weight': 150, 'inf_risks': 'BMI 45'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 96,
-        'name': 'Cachexia + bacteremia',
-        'input': {'age': 70, 'infection_type': 'bacteremia', 'weight': 45, 'inf_risks': 'cachexia'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 97,
-        'name': 'Prior ESBL organism',
-        'input': {'age': 65, 'infection_type': 'uti', 'fever': True, 'prior_resistance': 'ESBL E. coli (6 months ago)'},
-        'expected_route': 'IV'
+_EDGE_CASES = (
+    Case(
+        id=86,
+        name='Very elderly (95yo) + multiple comorbidities',
+        input={'age': 95, 'infection_type': 'uti', 'fever': True, 'crcl': 25, 'inf_risks': 'dementia, CHF'},
+        expect_warnings=True
+    ),
+    Case(
+        id=87,
+        name='Young adult (18yo) + no risk factors',
+        input={'age': 18, 'infection_type': 'uti', 'fever': True, 'crcl': 100},
+        expected_drugs=['Ceftriaxone']
+    ),
+    Case(
+        id=88,
+        name='Pregnancy + PCN anaphylaxis + pyelonephritis',
+        input={'age': 28, 'infection_type': 'uti', 'fever': True, 'pregnancy': 2, 'allergies': 'PCN (anaphylaxis)'},
+        expected_drugs=['Aztreonam'],  # Safe for both pregnancy and severe allergy
+        expected_allergy='severe_pcn_allergy'
+    ),
+    Case(
+        id=89,
+        name='ESRD on dialysis + intra-abdominal',
+        input={'age': 55, 'infection_type': 'intra_abdominal', 'crcl': 5, 'inf_risks': 'hemodialysis', 'weight': 70},
+        expect_warnings=True
+    ),
+    Case(
+        id=90,
+        name='Liver cirrhosis + ascites + peritonitis',
+        input={'age': 58, 'infection_type': 'intra_abdominal', 'inf_risks': 'cirrhosis', 'presentation': 'SBP'},
+        expected_route='IV'
+    ),
+    Case(
+        id=91,
+        name='Neutropenic fever',
+        input={'age': 45, 'infection_type': 'bacteremia', 'inf_risks': 'neutropenia ANC <500', 'weight': 65},
+        expected_route='IV'
+    ),
+    Case(
+        id=92,
+        name='Splenectomy + bacteremia',
+        input={'age': 50, 'infection_type': 'bacteremia', 'source_risk': 'asplenia', 'weight': 70},
+        expected_route='IV'
+    ),
+    Case(
+        id=93,
+        name='Cystic fibrosis + pneumonia',
+        input={'age': 28, 'infection_type': 'pneumonia', 'inf_risks': 'cystic fibrosis'},
+        expected_route='IV'
+    ),
+    Case(
+        id=94,
+        name='Post-transplant + multiple allergies',
+        input={'age': 55, 'infection_type': 'bacteremia', 'inf_risks': 'kidney transplant', 'allergies': 'PCN (rash), sulfa (rash)', 'weight': 75},
+        expected_route='IV'
+    ),
+    Case(
+        id=95,
+        name='Morbid obesity + intra-abdominal',
+        input={'age': 50, 'infection_type': 'intra_abdominal', 'weight': 150, 'inf_risks': 'BMI 45'},
+        expected_route='IV'
+    ),
+    Case(
+        id=96,
+        name='Cachexia + bacteremia',
+        input={'age': 70, 'infection_type': 'bacteremia', 'weight': 45, 'inf_risks': 'cachexia'},
+        expected_route='IV'
+    ),
+    Case(
+        id=97,
+        name='Prior ESBL organism',
+        input={'age': 65, 'infection_type': 'uti', 'fever': True, 'prior_resistance': 'ESBL E. coli (6 months ago)'},
+        expected_route='IV'
         # Note: Would need meropenem, but current system gives ceftriaxone
-    },
-    {
-        'id': 98,
-        'name': 'Prior Pseudomonas',
-        'input': {'age': 70, 'infection_type': 'pneumonia', 'prior_resistance': 'MDR Pseudomonas'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 99,
-        'name': 'Prior C. diff infection',
-        'input': {'age': 75, 'infection_type': 'intra_abdominal', 'prior_resistance': 'C. diff 3 months ago'},
-        'expected_route': 'IV'
-    },
-    {
-        'id': 100,
-        'name': 'Recent ICU stay + bacteremia',
-        'input': {'age': 68, 'infection_type': 'bacteremia', 'source_risk': 'recent ICU admission', 'mrsa_risk': True, 'weight': 70},
-        'expected_drugs_contains': ['Vancomycin'],
-        'expected_route': 'IV'
-    },
-])
+    ),
+    Case(
+        id=98,
+        name='Prior Pseudomonas',
+        input={'age': 70, 'infection_type': 'pneumonia', 'prior_resistance': 'MDR Pseudomonas'},
+        expected_route='IV'
+    ),
+    Case(
+        id=99,
+        name='Prior C. diff infection',
+        input={'age': 75, 'infection_type': 'intra_abdominal', 'prior_resistance': 'C. diff 3 months ago'},
+        expected_route='IV'
+    ),
+    Case(
+        id=100,
+        name='Recent ICU stay + bacteremia',
+        input={'age': 68, 'infection_type': 'bacteremia', 'source_risk': 'recent ICU admission', 'mrsa_risk': True, 'weight': 70},
+        expected_drugs_contains=['Vancomycin'],
+        expected_route='IV'
+    ),
+)
+
+# All cases as one immutable tuple, built once at import
+TEST_CASES = (
+    *_PYELO_BASIC,
+    *_PYELO_MILD_PCN,
+    *_PYELO_SEVERE_PCN,
+    *_PYELO_PREGNANCY,
+    *_INTRA_ABD_BASIC,
+    *_INTRA_ABD_MILD_PCN,
+    *_INTRA_ABD_SEVERE_PCN,
+    *_INTRA_ABD_COMPLEX,
+    *_BACTEREMIA_BASIC,
+    *_BACTEREMIA_PCN,
+    *_BACTEREMIA_COMPLEX,
+    *_PNEUMONIA,
+    *_MENINGITIS,
+    *_EDGE_CASES,
+)
+
+# Inverted index: infection_type -> cases
+CASES_BY_TYPE = defaultdict(list)
+for tc in TEST_CASES:
+    CASES_BY_TYPE[tc.input['infection_type']].append(tc)
+
+# Parametrize cases category by category, ids formatted once. The xdist_group
+# mark lets `pytest -n auto --dist loadgroup` keep each category on one worker.
+TEST_PARAMS = [
+    pytest.param(tc, id=f"Case{tc.id}: {tc.name}", marks=pytest.mark.xdist_group(name=infection_type))
+    for infection_type, cases in CASES_BY_TYPE.items()
+    for tc in cases
+]
+
+# Intern the categorical input strings once, so the engine's string comparisons
+# and dict lookups can short-circuit on identity
+_INTERNED_INPUT_KEYS = ('infection_type', 'location', 'presentation', 'source_risk')
+for tc in TEST_CASES:
+    for key in _INTERNED_INPUT_KEYS:
+        if isinstance(tc.input.get(key), str):
+            tc.input[key] = sys.intern(tc.input[key])
+
+# Lowercased forbidden-drug names per case id, normalized once at import
+FORBIDDEN_SETS = {
+    tc.id: frozenset(drug.lower() for drug in tc.forbidden_drugs)
+    for tc in TEST_CASES if tc.forbidden_drugs
+}
 
 
 # =============================================================================
@@ -770,51 +820,51 @@ TEST_CASES.extend([
 class TestComprehensiveCases:
     """Execute all 100 test cases"""
 
-    @pytest.mark.parametrize("test_case", TEST_CASES, ids=lambda tc: f"Case{tc['id']}: {tc['name']}")
+    @pytest.mark.parametrize("test_case", TEST_PARAMS)
     def test_case(self, engine, test_case):
         """Run single test case"""
-        result = engine.get_recommendation(test_case['input'])
+        result = engine.get_recommendation(test_case.input)
 
         # Assert success
         assert result['success'], f"Failed: {result.get('errors', 'Unknown error')}"
 
+        # Normalize drug names once; all drug checks below are substring tests on these
+        actual_drugs = [d['drug_name'] for d in result['drugs']]
+        actual_drugs_norm = [drug.lower() for drug in actual_drugs]
+        actual_joined = ' | '.join(actual_drugs_norm)
+
         # Check expected drugs if specified
-        if 'expected_drugs' in test_case:
-            actual_drugs = [d['drug_name'] for d in result['drugs']]
-            for expected_drug in test_case['expected_drugs']:
-                assert any(expected_drug in drug for drug in actual_drugs), \
+        if test_case.expected_drugs:
+            for expected_drug in test_case.expected_drugs:
+                assert expected_drug.lower() in actual_joined, \
                     f"Expected {expected_drug} not found in {actual_drugs}"
 
         # Check drugs_contains (at least one must match)
-        if 'expected_drugs_contains' in test_case:
-            actual_drugs = [d['drug_name'] for d in result['drugs']]
-            found = False
-            for expected_drug in test_case['expected_drugs_contains']:
-                if any(expected_drug.replace('_', '').lower() in drug.replace(' ', '').lower() 
-                       for drug in actual_drugs):
-                    found = True
-                    break
-            assert found, f"None of {test_case['expected_drugs_contains']} found in {actual_drugs}"
+        if test_case.expected_drugs_contains:
+            actual_compact = '|'.join(drug.replace(' ', '') for drug in actual_drugs_norm)
+            pattern = '|'.join(re.escape(expected.replace('_', '').lower())
+                               for expected in test_case.expected_drugs_contains)
+            assert re.search(pattern, actual_compact), \
+                f"None of {test_case.expected_drugs_contains} found in {actual_drugs}"
 
         # Check forbidden drugs
-        if 'forbidden_drugs' in test_case:
-            actual_drugs = [d['drug_name'] for d in result['drugs']]
-            for forbidden in test_case['forbidden_drugs']:
-                assert not any(forbidden in drug for drug in actual_drugs), \
-                    f"Forbidden drug {forbidden} found in {actual_drugs}"
+        forbidden_set = FORBIDDEN_SETS.get(test_case.id)
+        if forbidden_set:
+            found = sorted(f for f in forbidden_set if f in actual_joined)
+            assert not found, f"Forbidden drugs {found} found in {actual_drugs}"
 
         # Check expected route
-        if 'expected_route' in test_case:
-            assert result['route'] == test_case['expected_route'], \
-                f"Expected route {test_case['expected_route']}, got {result['route']}"
+        if test_case.expected_route is not None:
+            assert result['route'] == test_case.expected_route, \
+                f"Expected route {test_case.expected_route}, got {result['route']}"
 
         # Check allergy classification
-        if 'expected_allergy' in test_case:
-            assert result['allergy_classification'] == test_case['expected_allergy'], \
-                f"Expected allergy {test_case['expected_allergy']}, got {result['allergy_classification']}"
+        if test_case.expected_allergy is not None:
+            assert result['allergy_classification'] == test_case.expected_allergy, \
+                f"Expected allergy {test_case.expected_allergy}, got {result['allergy_classification']}"
 
         # Check warnings exist if expected
-        if test_case.get('expect_warnings'):
+        if test_case.expect_warnings:
             assert len(result['warnings']) > 0, "Expected warnings but none found"
 
 
@@ -1,274 +1,268 @@
 """
 Unit tests for drug selection with allergy considerations
 Critical safety tests to ensure contraindicated drugs are never recommended
+
+Every patient case is sent to the backend once, concurrently, by the
+``all_results`` fixture; test_allergy_case then checks each cached result
+against its EXPECTATIONS entry.
 """
 import pytest
 import asyncio
 import os
+import re
+import httpx
 from agno_bridge_v2 import AgnoBackendBridge, InfectionCategory
 
-
-@pytest.fixture
+# Skip the whole module at collection time, rather than per test in the api_key fixture,
+# and keep it on one pytest-xdist worker so all_results runs its batch once
+pytestmark = [
+    pytest.mark.skipif(not os.getenv('OPENROUTER_API_KEY'), reason='OPENROUTER_API_KEY not set'),
+    pytest.mark.xdist_group(name="allergy-llm"),
+]
+
+
+# Patient cases for every test in this module, keyed by test id
+ALLERGY_PATIENTS = {
+    'bacteremia_anaphylaxis': {
+        'age': '88',
+        'gender': 'male',
+        'location': 'Ward',
+        'infection_type': 'bacteremia',
+        'gfr': '44',
+        'allergies': 'Penicillin (anaphylaxis)',
+        'inf_risks': 'MRSA colonization'
+    },
+    'pyelonephritis_anaphylaxis': {
+        'age': '45',
+        'gender': 'female',
+        'location': 'Ward',
+        'infection_type': 'pyelonephritis',
+        'gfr': '75',
+        'allergies': 'Penicillin (anaphylaxis)'
+    },
+    'meningitis_anaphylaxis_sjs': {
+        'age': '35',
+        'gender': 'male',
+        'location': 'ICU',
+        'infection_type': 'meningitis',
+        'gfr': '90',
+        'allergies': 'Penicillin (anaphylaxis, SJS)',
+        'inf_risks': 'Recent neurosurgery'
+    },
+    'bacteremia_rash': {
+        'age': '65',
+        'gender': 'female',
+        'location': 'Ward',
+        'infection_type': 'bacteremia',
+        'gfr': '55',
+        'allergies': 'Penicillin (rash)'
+    },
+    'pyelonephritis_rash': {
+        'age': '50',
+        'gender': 'female',
+        'location': 'Ward',
+        'infection_type': 'pyelonephritis',
+        'gfr': '85',
+        'allergies': 'Penicillin (rash, mild)'
+    },
+    'sepsis_anaphylaxis': {
+        'age': '40',
+        'gender': 'male',
+        'location': 'ED',
+        'infection_type': 'sepsis',
+        'gfr': '70',
+        'allergies': 'Penicillin (anaphylaxis)'
+    },
+    'pneumonia_sjs': {
+        'age': '30',
+        'gender': 'female',
+        'location': 'Ward',
+        'infection_type': 'pneumonia',
+        'gfr': '90',
+        'allergies': 'Penicillin (SJS)'
+    },
+    'bacteremia_dress': {
+        'age': '55',
+        'gender': 'male',
+        'location': 'ICU',
+        'infection_type': 'bacteremia',
+        'gfr': '60',
+        'allergies': 'Penicillin (DRESS syndrome)'
+    },
+    'bacteremia_anaphylaxis_no_mention': {
+        'age': '70',
+        'gender': 'male',
+        'location': 'Ward',
+        'infection_type': 'bacteremia',
+        'gfr': '50',
+        'allergies': 'Penicillin (anaphylaxis)'
+    },
+}
+
+
+def _any_of(*terms):
+    """Compile a case-insensitive pattern matching any of the literal terms"""
+    return re.compile('|'.join(map(re.escape, terms)), re.IGNORECASE)
+
+
+# Drugs that must never appear in a recommendation, one pattern per scenario
+SEVERE_FORBIDDEN_RE = _any_of('cefepime', 'ceftriaxone', 'cefazolin', 'ceftazidime', 'cefotaxime', 'piperacillin')
+MENINGITIS_FORBIDDEN_RE = _any_of('cefepime', 'ceftriaxone', 'cefotaxime', 'meropenem', 'ampicillin')
+SJS_FORBIDDEN_RE = _any_of('cef', 'ampicillin', 'piperacillin', 'meropenem')
+
+# Whichever of ceftriaxone/ciprofloxacin is mentioned first wins the match
+CEFTRIAXONE_BEFORE_CIPRO_RE = re.compile(r'(ceftriaxone)|(ciprofloxacin)', re.IGNORECASE)
+
+# Phrases that name a contraindicated drug instead of just recommending the alternative.
+# One alternation scans the text once however many phrases are added.
+CONTRAINDICATED_PHRASE_RE = _any_of(
+    'piperacillin-tazobactam is contraindicated',
+    'piperacillin-tazobactam (contraindicated)',
+    'cefepime is contraindicated',
+    'cefepime (since',
+    'avoid piperacillin',
+    'avoid cefepime'
+)
+
+
+# What each ALLERGY_PATIENTS result must (not) contain, checked by test_allergy_case:
+#   forbidden      - pattern that must not match the recommendation
+#   required_all   - every drug must be mentioned
+#   required_any   - at least one drug must be mentioned
+#   first_match    - two-group pattern whose first match must be group 1
+#   min_confidence - lower bound on tuhs_confidence
+EXPECTATIONS = {
+    # Severe PCN allergy: no cephalosporins; aztreonam/FQ plus vancomycin for MRSA
+    'bacteremia_anaphylaxis': {
+        'forbidden': SEVERE_FORBIDDEN_RE,
+        'required_any': ('aztreonam', 'fluoroquinolone'),
+        'required_all': ('vancomycin',),
+    },
+    # Pyelonephritis + anaphylaxis gets aztreonam, never ceftriaxone (or variants)
+    'pyelonephritis_anaphylaxis': {
+        'forbidden': _any_of('ceftr'),
+        'required_all': ('aztreonam',),
+    },
+    # Meningitis + anaphylaxis/SJS must use non-beta-lactam alternatives
+    'meningitis_anaphylaxis_sjs': {
+        'forbidden': MENINGITIS_FORBIDDEN_RE,
+    },
+    # Mild PCN allergy (rash) can use cephalosporins - just expect a confident answer
+    'bacteremia_rash': {
+        'min_confidence': 0.7,
+    },
+    # Pyelonephritis + mild PCN allergy gets ceftriaxone, ahead of ciprofloxacin
+    'pyelonephritis_rash': {
+        'required_all': ('ceftriaxone',),
+        'first_match': CEFTRIAXONE_BEFORE_CIPRO_RE,
+    },
+    # Anaphylaxis must follow the severe allergy protocol
+    'sepsis_anaphylaxis': {
+        'required_any': ('aztreonam', 'vancomycin'),
+    },
+    # Stevens-Johnson Syndrome: avoid ALL beta-lactams
+    'pneumonia_sjs': {
+        'forbidden': SJS_FORBIDDEN_RE,
+    },
+    # DRESS syndrome is a severe allergy
+    'bacteremia_dress': {
+        'required_all': ('aztreonam',),
+    },
+    # Don't say "Drug X is contraindicated, use Drug Y" - just recommend Drug Y
+    'bacteremia_anaphylaxis_no_mention': {
+        'forbidden': CONTRAINDICATED_PHRASE_RE,
+    },
+}
+
+# Cases that must pass for deployment
+CRITICAL_CASES = frozenset({
+    'bacteremia_anaphylaxis', 'pyelonephritis_anaphylaxis', 'meningitis_anaphylaxis_sjs',
+    'sepsis_anaphylaxis', 'pneumonia_sjs', 'bacteremia_dress', 'bacteremia_anaphylaxis_no_mention',
+})
+
+ALLERGY_CASE_PARAMS = [
+    pytest.param(case_id, marks=pytest.mark.critical) if case_id in CRITICAL_CASES else case_id
+    for case_id in ALLERGY_PATIENTS
+]
+
+
+@pytest.fixture(scope="session")
 def api_key():
-    """Get API key from environment"""
-    key = os.getenv('OPENROUTER_API_KEY')
-    if not key:
-        pytest.skip("OPENROUTER_API_KEY not set")
-    return key
+    """Get API key from environment (the module is skipped when it is unset)"""
+    return os.environ['OPENROUTER_API_KEY']
 
 
-@pytest.fixture
-def backend_bridge(api_key):
-    """Create backend bridge instance"""
-    return AgnoBackendBridge(api_key=api_key)
+@pytest.fixture(scope="session")
+async def http_client():
+    """One pooled keep-alive HTTP client for this module's backend calls, closed at session end"""
+    async with httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60)
+    ) as client:
+        yield client
 
 
-@pytest.mark.integration
-@pytest.mark.critical
-@pytest.mark.allergy
-class TestSeverePenicillinAllergy:
-    """Critical tests for severe penicillin allergy (anaphylaxis)"""
-
-    @pytest.mark.asyncio
-    async def test_bacteremia_anaphylaxis_no_cephalosporins(self, backend_bridge):
-        """
-        CRITICAL: Patient with bacteremia + anaphylaxis to PCN should NOT get cephalosporins
-        Expected: Aztreonam + Vancomycin
-        Forbidden: Cefepime, Ceftriaxone, Piperacillin-tazobactam
-        """
-        patient_data = {
-            'age': '88',
-            'gender': 'male',
-            'location': 'Ward',
-            'infection_type': 'bacteremia',
-            'gfr': '44',
-            'allergies': 'Penicillin (anaphylaxis)',
-            'inf_risks': 'MRSA colonization'
-        }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # MUST NOT contain any cephalosporins
-        forbidden_drugs = ['cefepime', 'ceftriaxone', 'cefazolin', 'ceftazidime', 'cefotaxime', 'piperacillin']
-        for drug in forbidden_drugs:
-            assert drug not in recommendation, f"❌ CRITICAL SAFETY VIOLATION: {drug} recommended for anaphylaxis patient!"
-
-        # SHOULD contain appropriate alternatives
-        assert 'aztreonam' in recommendation or 'fluoroquinolone' in recommendation, \
-            "Expected aztreonam or fluoroquinolone for severe PCN allergy"
-        assert 'vancomycin' in recommendation, "Expected vancomycin for MRSA coverage"
-
-    @pytest.mark.asyncio
-    async def test_pyelonephritis_anaphylaxis_no_cephalosporins(self, backend_bridge):
-        """
-        CRITICAL: Pyelonephritis + anaphylaxis should get aztreonam, NOT ceftriaxone
-        """
-        patient_data = {
-            'age': '45',
-            'gender': 'female',
-            'location': 'Ward',
-            'infection_type': 'pyelonephritis',
-            'gfr': '75',
-            'allergies': 'Penicillin (anaphylaxis)'
-        }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # MUST NOT contain ceftriaxone
-        assert 'ceftriaxone' not in recommendation, \
-            "❌ CRITICAL: Ceftriaxone recommended for anaphylaxis patient!"
-        assert 'ceftr' not in recommendation, \
-            "❌ CRITICAL: Ceftriaxone variant recommended for anaphylaxis patient!"
-
-        # SHOULD contain aztreonam
-        assert 'aztreonam' in recommendation, "Expected aztreonam for severe PCN allergy"
-
-    @pytest.mark.asyncio
-    async def test_meningitis_anaphylaxis_no_cephalosporins(self, backend_bridge):
-        """
-        CRITICAL: Meningitis + anaphylaxis is high-risk scenario
-        Must use non-beta-lactam alternatives
-        """
-        patient_data = {
-            'age': '35',
-            'gender': 'male',
-            'location': 'ICU',
-            'infection_type': 'meningitis',
-            'gfr': '90',
-            'allergies': 'Penicillin (anaphylaxis, SJS)',
-            'inf_risks': 'Recent neurosurgery'
-        }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # MUST NOT contain any beta-lactams
-        forbidden_drugs = ['cefepime', 'ceftriaxone', 'cefotaxime', 'meropenem', 'ampicillin']
-        for drug in forbidden_drugs:
-            assert drug not in recommendation, \
-                f"❌ CRITICAL: {drug} recommended for SJS/anaphylaxis patient!"
+@pytest.fixture(scope="session")
+def backend_bridge(api_key, http_client):
+    """Create one backend bridge for the session (tests must not mutate or close it)"""
+    return AgnoBackendBridge(api_key=api_key, http_client=http_client)
 
 
-@pytest.mark.integration
-@pytest.mark.allergy
-class TestMildPenicillinAllergy:
-    """Tests for mild-moderate penicillin allergy (rash only)"""
-
-    @pytest.mark.asyncio
-    async def test_bacteremia_rash_can_use_cephalosporins(self, backend_bridge):
-        """
-        Mild PCN allergy (rash) CAN use cephalosporins
-        Expected: Cefepime or Ceftriaxone is acceptable
-        """
-        patient_data = {
-            'age': '65',
-            'gender': 'female',
-            'location': 'Ward',
-            'infection_type': 'bacteremia',
-            'gfr': '55',
-            'allergies': 'Penicillin (rash)'
-        }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # For mild allergy, cephalosporins are acceptable
-        # Just verify no error and confidence is reasonable
-        assert result['tuhs_confidence'] >= 0.7, "Low confidence for straightforward mild allergy case"
-
-    @pytest.mark.asyncio
-    async def test_pyelonephritis_rash_gets_ceftriaxone(self, backend_bridge):
-        """
-        Pyelonephritis + mild PCN allergy should get ceftriaxone
-        """
-        patient_data = {
-            'age': '50',
-            'gender': 'female',
-            'location': 'Ward',
-            'infection_type': 'pyelonephritis',
-            'gfr': '85',
-            'allergies': 'Penicillin (rash, mild)'
-        }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # Should contain ceftriaxone for mild allergy
-        assert 'ceftriaxone' in recommendation, "Expected ceftriaxone for mild PCN allergy"
-        # Should NOT contain ciprofloxacin as first-line
-        assert result['tuhs_recommendation'].find('ceftriaxone') < result['tuhs_recommendation'].find('ciprofloxacin') \
-            if 'ciprofloxacin' in recommendation else True, \
-            "Ceftriaxone should be recommended before ciprofloxacin"
+@pytest.fixture(scope="session")
+async def all_results(backend_bridge, backend_cassette):
+    """Process every ALLERGY_PATIENTS case concurrently, once per session.
 
+    Returns {test_id: result}. A request that raised is stored as the
+    exception and re-raised by get_result() in the test that needs it.
+    OpenRouter traffic is recorded to / replayed from the
+    'drug_selection_allergy' cassette when vcrpy is installed.
+    """
+    with backend_cassette('drug_selection_allergy'):
+        results = await asyncio.gather(
+            *(backend_bridge.process_request(p) for p in ALLERGY_PATIENTS.values()),
+            return_exceptions=True
+        )
+    return dict(zip(ALLERGY_PATIENTS, results))
 
-@pytest.mark.integration
-@pytest.mark.allergy
-@pytest.mark.critical
-class TestAllergyClassification:
-    """Test that allergy severity is correctly classified"""
-
-    @pytest.mark.asyncio
-    async def test_anaphylaxis_treated_as_severe(self, backend_bridge):
-        """Anaphylaxis must be treated as severe allergy"""
-        patient_data = {
-            'age': '40',
-            'gender': 'male',
-            'location': 'ED',
-            'infection_type': 'sepsis',
-            'gfr': '70',
-            'allergies': 'Penicillin (anaphylaxis)'
-        }
-
-        result = await backend_bridge.process_request(patient_data)
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # Must follow severe allergy protocol
-        assert 'aztreonam' in recommendation or 'vancomycin' in recommendation, \
-            "Anaphylaxis not treated as severe allergy"
-
-    @pytest.mark.asyncio
-    async def test_sjs_treated_as_severe(self, backend_bridge):
-        """Stevens-Johnson Syndrome must be treated as severe allergy"""
-        patient_data = {
-            'age': '30',
-            'gender': 'female',
-            'location': 'Ward',
-            'infection_type': 'pneumonia',
-            'gfr': '90',
-            'allergies': 'Penicillin (SJS)'
-        }
-
-        result = await backend_bridge.process_request(patient_data)
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # Must avoid ALL beta-lactams
-        forbidden = ['cef', 'ampicillin', 'piperacillin', 'meropenem']
-        for drug in forbidden:
-            assert drug not in recommendation, f"SJS patient given beta-lactam: {drug}"
-
-    @pytest.mark.asyncio
-    async def test_dress_treated_as_severe(self, backend_bridge):
-        """DRESS syndrome must be treated as severe allergy"""
-        patient_data = {
-            'age': '55',
-            'gender': 'male',
-            'location': 'ICU',
-            'infection_type': 'bacteremia',
-            'gfr': '60',
-            'allergies': 'Penicillin (DRESS syndrome)'
-        }
-
-        result = await backend_bridge.process_request(patient_data)
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # Must avoid beta-lactams
-        assert 'aztreonam' in recommendation, "DRESS not treated as severe allergy"
+
+def get_result(all_results, test_id):
+    """Return the cached result for test_id, re-raising a failed request"""
+    result = all_results[test_id]
+    if isinstance(result, BaseException):
+        raise result
+    return result
 
 
 @pytest.mark.integration
-@pytest.mark.critical
-class TestNoAllergyMentionedDrugs:
-    """Test that contraindicated drugs are NEVER mentioned, even to say they're contraindicated"""
-
-    @pytest.mark.asyncio
-    async def test_no_mention_of_contraindicated_drugs(self, backend_bridge):
-        """
-        CRITICAL: Don't say "Drug X is contraindicated, use Drug Y"
-        Just recommend Drug Y directly
-        """
-        patient_data = {
-            'age': '70',
-            'gender': 'male',
-            'location': 'Ward',
-            'infection_type': 'bacteremia',
-            'gfr': '50',
-            'allergies': 'Penicillin (anaphylaxis)'
-        }
-
-        result = await backend_bridge.process_request(patient_data)
-        recommendation = result['tuhs_recommendation']
-
-        # Should not contain phrases like "is contraindicated" or "should be avoided"
-        # in the context of listing the drugs
-        problematic_phrases = [
-            'piperacillin-tazobactam is contraindicated',
-            'piperacillin-tazobactam (contraindicated)',
-            'cefepime is contraindicated',
-            'cefepime (since',
-            'avoid piperacillin',
-            'avoid cefepime'
-        ]
-
-        for phrase in problematic_phrases:
-            assert phrase.lower() not in recommendation.lower(), \
-                f"❌ Recommendation mentions contraindicated drug: '{phrase}'"
+@pytest.mark.allergy
+@pytest.mark.parametrize('case_id', ALLERGY_CASE_PARAMS)
+def test_allergy_case(all_results, case_id):
+    """Check one ALLERGY_PATIENTS result against its EXPECTATIONS entry"""
+    result = get_result(all_results, case_id)
+    expected = EXPECTATIONS[case_id]
+    recommendation = result['tuhs_recommendation'].lower()
+
+    forbidden = expected.get('forbidden')
+    if forbidden is not None:
+        hits = forbidden.findall(recommendation)
+        assert not hits, f"❌ CRITICAL SAFETY VIOLATION ({case_id}): recommendation mentions {hits}"
+
+    for drug in expected.get('required_all', ()):
+        assert drug in recommendation, f"Expected {drug} for {case_id}"
+
+    required_any = expected.get('required_any')
+    if required_any:
+        assert any(drug in recommendation for drug in required_any), \
+            f"Expected one of {required_any} for {case_id}"
+
+    ordered = expected.get('first_match')
+    if ordered is not None:
+        first = ordered.search(recommendation)
+        assert first is None or first.group(1) is not None, \
+            f"Expected {ordered.pattern} to match its first alternative first for {case_id}"
+
+    if 'min_confidence' in expected:
+        assert result['tuhs_confidence'] >= expected['min_confidence'], \
+            f"Low confidence for straightforward case {case_id}"
 
 
 if __name__ == '__main__':
@@ -1,14 +1,40 @@
 """
 End-to-End Test Scenarios
 Real-world clinical scenarios testing the complete workflow
+
+Every patient in ALL_PAYLOADS is sent to the backend once, concurrently, by
+the ``scenario_results`` fixture; each test then checks its cached result.
 """
 import pytest
 import asyncio
+import functools
 import os
+import re
+import httpx
+from dataclasses import dataclass
+from typing import Any, Dict
 from agno_bridge_v2 import AgnoBackendBridge
 
+# Keep the whole module on one pytest-xdist worker, so scenario_results runs its batch once
+pytestmark = [pytest.mark.xdist_group(name="e2e-llm")]
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedResult:
+    """A process_request result plus its recommendation casefolded once for matching"""
+    raw: Dict[str, Any]
+    rec_lower: str
+
+    @classmethod
+    def from_result(cls, result):
+        return cls(raw=result, rec_lower=result['tuhs_recommendation'].casefold())
+
+
+# Cap on in-flight OpenRouter requests while the scenario batch runs
+MAX_CONCURRENT_REQUESTS = 8
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def api_key():
     """Get API key from environment"""
     key = os.getenv('OPENROUTER_API_KEY')
@@ -17,56 +43,53 @@ def api_key():
     return key
 
 
-@pytest.fixture
-def backend_bridge(api_key):
-    """Create backend bridge instance"""
-    return AgnoBackendBridge(api_key=api_key)
+@pytest.fixture(scope="session")
+async def http_client():
+    """One pooled HTTP/2 keep-alive client for every OpenRouter call in the session"""
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=60,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    ) as client:
+        yield client
 
 
-@pytest.mark.e2e
-@pytest.mark.critical
-class TestCriticalClinicalScenarios:
-    """E2E tests for critical clinical scenarios that must work correctly"""
+@pytest.fixture(scope="session")
+def backend_bridge(api_key, http_client):
+    """Create one backend bridge for the session (tests must not mutate it)"""
+    return AgnoBackendBridge(api_key=api_key, http_client=http_client)
 
-    @pytest.mark.asyncio
-    async def test_scenario_1_pyelonephritis_no_allergy(self, backend_bridge):
-        """
-        Scenario 1: Simple pyelonephritis, no allergies
-        Expected: Ceftriaxone IV (NOT ciprofloxacin)
-        """
-        patient_data = {
+
+# Expected-outcome keys used by check_result():
+#   category       - expected result['category']
+#   min_confidence - lower bound on tuhs_confidence
+#   required       - each entry must be mentioned; a tuple entry means "any one of these"
+#   forbidden      - drugs that must not be mentioned
+#   ordering       - (first, second) pairs: if second is mentioned, first must come before it
+
+# Critical clinical scenarios that must work correctly, keyed by test id: (patient, expected)
+CLINICAL_CASES = {
+    # Simple pyelonephritis, no allergies: ceftriaxone IV, NOT ciprofloxacin first-line
+    'pyelo_no_allergy': (
+        {
             'age': '35',
             'gender': 'female',
             'location': 'Ward',
             'infection_type': 'pyelonephritis',
             'gfr': '85',
             'allergies': 'None'
+        },
+        {
+            'category': 'pyelonephritis',
+            'min_confidence': 0.8,
+            'required': ('ceftriaxone',),
+            'ordering': (('ceftriaxone', 'ciprofloxacin'),),
         }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        assert result['category'] == 'pyelonephritis'
-        assert result['tuhs_confidence'] >= 0.8
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # PRIMARY CHECK: Ceftriaxone should be recommended
-        assert 'ceftriaxone' in recommendation, "❌ Missing ceftriaxone for simple pyelonephritis"
-
-        # SAFETY CHECK: Ciprofloxacin should NOT be first-line
-        if 'ciprofloxacin' in recommendation:
-            ceftriaxone_pos = recommendation.find('ceftriaxone')
-            cipro_pos = recommendation.find('ciprofloxacin')
-            assert ceftriaxone_pos < cipro_pos, \
-                "❌ Ciprofloxacin mentioned before ceftriaxone"
-
-    @pytest.mark.asyncio
-    async def test_scenario_2_bacteremia_mrsa_anaphylaxis(self, backend_bridge):
-        """
-        Scenario 2: Bacteremia with MRSA colonization + severe PCN allergy
-        Expected: Vancomycin + Aztreonam
-        Forbidden: Any cephalosporins or penicillins
-        """
-        patient_data = {
+    ),
+    # Bacteremia with MRSA colonization + severe PCN allergy: vancomycin + aztreonam,
+    # no cephalosporins or penicillins
+    'bacteremia_mrsa_anaphylaxis': (
+        {
             'age': '88',
             'gender': 'male',
             'location': 'Ward',
@@ -75,32 +98,16 @@ class TestCriticalClinicalScenarios:
             'allergies': 'Penicillin (anaphylaxis)',
             'inf_risks': 'MRSA colonization, recent surgery',
             'prior_resistance': 'MRSA positive 3 months ago'
+        },
+        {
+            'required': ('vancomycin', 'aztreonam'),
+            'forbidden': ('cefepime', 'ceftriaxone', 'cefazolin', 'piperacillin'),
         }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # MUST HAVE: Vancomycin for MRSA
-        assert 'vancomycin' in recommendation, "❌ Missing vancomycin for MRSA coverage"
-
-        # MUST HAVE: Aztreonam for gram-negative coverage (severe allergy)
-        assert 'aztreonam' in recommendation, "❌ Missing aztreonam for severe PCN allergy"
-
-        # MUST NOT HAVE: Any cephalosporins
-        forbidden = ['cefepime', 'ceftriaxone', 'cefazolin', 'piperacillin']
-        for drug in forbidden:
-            assert drug not in recommendation, \
-                f"❌ CRITICAL SAFETY VIOLATION: {drug} for anaphylaxis patient!"
-
-    @pytest.mark.asyncio
-    async def test_scenario_3_meningitis_no_allergy(self, backend_bridge):
-        """
-        Scenario 3: Bacterial meningitis, no allergies
-        Expected: Vancomycin + Ceftriaxone (higher doses for meningitis)
-        Note: Dosing verification will be in Step 2 tests
-        """
-        patient_data = {
+    ),
+    # Bacterial meningitis, no allergies: vancomycin + ceftriaxone
+    # (meningitis dosing is verified in the Step 2 tests)
+    'meningitis_no_allergy': (
+        {
             'age': '45',
             'gender': 'male',
             'location': 'ICU',
@@ -108,23 +115,14 @@ class TestCriticalClinicalScenarios:
             'gfr': '90',
             'allergies': 'None',
             'inf_risks': 'Acute onset, fever, altered mental status'
+        },
+        {
+            'required': ('vancomycin', 'ceftriaxone'),
         }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # MUST HAVE: Both vancomycin and ceftriaxone
-        assert 'vancomycin' in recommendation, "❌ Missing vancomycin for meningitis"
-        assert 'ceftriaxone' in recommendation, "❌ Missing ceftriaxone for meningitis"
-
-    @pytest.mark.asyncio
-    async def test_scenario_4_pneumonia_ward(self, backend_bridge):
-        """
-        Scenario 4: Community-acquired pneumonia, ward patient
-        Expected: Ceftriaxone + Azithromycin (or doxycycline)
-        """
-        patient_data = {
+    ),
+    # Community-acquired pneumonia, ward patient: beta-lactam + atypical coverage
+    'pneumonia_ward': (
+        {
             'age': '65',
             'gender': 'male',
             'location': 'Ward',
@@ -132,28 +130,15 @@ class TestCriticalClinicalScenarios:
             'gfr': '75',
             'allergies': 'None',
             'inf_risks': 'Community-acquired, no recent hospitalization'
+        },
+        {
+            'required': (('ceftriaxone', 'ampicillin'), ('azithromycin', 'doxycycline')),
         }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # Should have beta-lactam coverage
-        assert any(drug in recommendation for drug in ['ceftriaxone', 'ampicillin']), \
-            "Missing beta-lactam for CAP"
-
-        # Should have atypical coverage
-        assert any(drug in recommendation for drug in ['azithromycin', 'doxycycline']), \
-            "Missing atypical coverage for CAP"
-
-    @pytest.mark.asyncio
-    async def test_scenario_5_pregnant_pyelonephritis(self, backend_bridge):
-        """
-        Scenario 5: Pregnant patient with pyelonephritis
-        Expected: Ceftriaxone IV (safe in pregnancy)
-        Forbidden: Fluoroquinolones, TMP/SMX
-        """
-        patient_data = {
+    ),
+    # Pregnant patient with pyelonephritis: ceftriaxone IV, no fluoroquinolones,
+    # and pregnancy safety must be addressed
+    'pregnant_pyelonephritis': (
+        {
             'age': '28',
             'gender': 'female',
             'location': 'Ward',
@@ -161,31 +146,16 @@ class TestCriticalClinicalScenarios:
             'gfr': '95',
             'allergies': 'None',
             'inf_risks': 'Pregnancy - 24 weeks gestation'
+        },
+        {
+            'required': ('ceftriaxone', 'pregnan'),
+            'forbidden': ('ciprofloxacin', 'levofloxacin', 'moxifloxacin'),
         }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # MUST HAVE: Ceftriaxone (safe in pregnancy)
-        assert 'ceftriaxone' in recommendation, "❌ Missing ceftriaxone for pregnant patient"
-
-        # MUST NOT HAVE: Fluoroquinolones (contraindicated in pregnancy)
-        forbidden_in_pregnancy = ['ciprofloxacin', 'levofloxacin', 'moxifloxacin']
-        for drug in forbidden_in_pregnancy:
-            assert drug not in recommendation, \
-                f"❌ CRITICAL: {drug} recommended in pregnancy!"
-
-        # SHOULD MENTION: Pregnancy safety
-        assert 'pregnan' in recommendation, "Should address pregnancy safety"
-
-    @pytest.mark.asyncio
-    async def test_scenario_6_icu_sepsis_shock(self, backend_bridge):
-        """
-        Scenario 6: Septic shock in ICU, unknown source
-        Expected: Broad-spectrum coverage (pip-tazo or cefepime + vancomycin + metronidazole)
-        """
-        patient_data = {
+    ),
+    # Septic shock in ICU, unknown source: broad-spectrum beta-lactam + vancomycin
+    # + anaerobic coverage
+    'icu_sepsis_shock': (
+        {
             'age': '70',
             'gender': 'female',
             'location': 'ICU',
@@ -193,32 +163,22 @@ class TestCriticalClinicalScenarios:
             'gfr': '35',
             'allergies': 'None',
             'inf_risks': 'Septic shock, unknown source, intubated'
+        },
+        {
+            'required': (
+                ('piperacillin', 'cefepime', 'meropenem'),
+                'vancomycin',
+                ('metronidazole', 'piperacillin'),
+            ),
         }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # Need broad-spectrum coverage
-        assert any(drug in recommendation for drug in ['piperacillin', 'cefepime', 'meropenem']), \
-            "Missing broad-spectrum beta-lactam for septic shock"
-
-        # Need MRSA coverage
-        assert 'vancomycin' in recommendation, "Missing vancomycin for septic shock"
-
-        # Need anaerobic coverage
-        assert 'metronidazole' in recommendation or 'piperacillin' in recommendation, \
-            "Missing anaerobic coverage"
-
-
-@pytest.mark.e2e
-class TestEdgeCases:
-    """E2E tests for edge cases and complex scenarios"""
-
-    @pytest.mark.asyncio
-    async def test_dialysis_patient(self, backend_bridge):
-        """Test patient on hemodialysis"""
-        patient_data = {
+    ),
+}
+
+# Edge cases and complex scenarios, keyed by test id: (patient, expected)
+EDGE_CASES = {
+    # Hemodialysis: reasonable confidence, and either HD-specific dosing or an ID consult
+    'dialysis': (
+        {
             'age': '75',
             'gender': 'male',
             'location': 'Ward',
@@ -226,60 +186,186 @@ class TestEdgeCases:
             'gfr': '10',
             'allergies': 'None',
             'inf_risks': 'On hemodialysis MWF, central line'
+        },
+        {
+            'min_confidence': 0.6,
+            'required': (('hemodialysis', 'dialysis', 'id'),),
         }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        # Should succeed and have reasonable confidence
-        assert result['tuhs_confidence'] >= 0.6, "Very low confidence for HD patient"
-
-        # Should recommend ID consultation for complex case
-        recommendation = result['tuhs_recommendation'].lower()
-        # Either has specific HD dosing or recommends consultation
-        assert 'hemodialysis' in recommendation or 'dialysis' in recommendation or 'id' in recommendation
-
-    @pytest.mark.asyncio
-    async def test_multiple_drug_allergies(self, backend_bridge):
-        """Test patient with multiple drug allergies"""
-        patient_data = {
+    ),
+    # Multiple drug allergies: no penicillins/cephalosporins, sulfa drugs or vancomycin
+    'multiple_drug_allergies': (
+        {
             'age': '55',
             'gender': 'female',
             'location': 'Ward',
             'infection_type': 'pneumonia',
             'gfr': '60',
             'allergies': 'Penicillin (anaphylaxis), Sulfa (rash), Vancomycin (red man syndrome)'
+        },
+        {
+            'forbidden': ('penicillin', 'ceftriaxone', 'cefepime', 'trimethoprim', 'sulfamethoxazole', 'vancomycin'),
         }
-
-        result = await backend_bridge.process_request(patient_data)
-
-        recommendation = result['tuhs_recommendation'].lower()
-
-        # Should work around all allergies
-        # No penicillins/cephalosporins, no sulfa drugs, no vancomycin
-        forbidden = ['penicillin', 'ceftriaxone', 'cefepime', 'trimethoprim', 'sulfamethoxazole', 'vancomycin']
-        for drug in forbidden:
-            assert drug not in recommendation, f"Recommended allergic drug: {drug}"
-
-    @pytest.mark.asyncio
-    async def test_very_low_gfr(self, backend_bridge):
-        """Test patient with severe renal impairment"""
-        patient_data = {
+    ),
+    # Severe renal impairment: Step 1 only selects drugs (renal dosing is Step 2),
+    # so just expect a confident, appropriate pyelonephritis recommendation
+    'very_low_gfr': (
+        {
             'age': '80',
             'gender': 'male',
             'location': 'Ward',
             'infection_type': 'pyelonephritis',
             'gfr': '15',
             'allergies': 'None'
+        },
+        {
+            'min_confidence': 0.7,
+            'required': ('ceftriaxone',),
         }
+    ),
+}
+
+
+# Patient sent twice by the nightly test_nondeterminism_bounded
+CONSISTENCY_PATIENT = {
+    'age': '50',
+    'gender': 'female',
+    'location': 'Ward',
+    'infection_type': 'pyelonephritis',
+    'gfr': '70',
+    'allergies': 'None'
+}
+
+# Patients checked by TestConsistency, keyed by scenario id
+CONSISTENCY_CASES = {
+    # Two similar pyelonephritis cases, slightly different ages
+    'similar_case_1': {
+        'age': '35',
+        'gender': 'female',
+        'location': 'Ward',
+        'infection_type': 'pyelonephritis',
+        'gfr': '85',
+        'allergies': 'None'
+    },
+    'similar_case_2': {
+        'age': '38',
+        'gender': 'female',
+        'location': 'Ward',
+        'infection_type': 'pyelonephritis',
+        'gfr': '80',
+        'allergies': 'None'
+    },
+}
+
+# Every patient sent to the backend by this module's batch, keyed by scenario id
+ALL_PAYLOADS = {
+    **{scenario_id: patient for scenario_id, (patient, _) in CLINICAL_CASES.items()},
+    **{scenario_id: patient for scenario_id, (patient, _) in EDGE_CASES.items()},
+    **CONSISTENCY_CASES,
+}
+
+
+@pytest.fixture(scope="session")
+async def scenario_results(backend_bridge, backend_cassette):
+    """Process every ALL_PAYLOADS patient concurrently, once per session.
+
+    Identical patients registered under several ids are sent only once.
+    Returns {scenario_id: NormalizedResult}. A request that raised is stored
+    as the exception and re-raised by get_result() in the test that needs it.
+    """
+    # One entry per distinct patient, in first-seen order
+    unique = {frozenset(patient.items()): patient for patient in ALL_PAYLOADS.values()}
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def process(patient):
+        async with semaphore:
+            return await backend_bridge.process_request(patient)
+
+    with backend_cassette('e2e_scenarios'):
+        responses = await asyncio.gather(
+            *(process(patient) for patient in unique.values()),
+            return_exceptions=True
+        )
+
+    results = {
+        key: result if isinstance(result, BaseException) else NormalizedResult.from_result(result)
+        for key, result in zip(unique, responses)
+    }
+    return {
+        scenario_id: results[frozenset(patient.items())]
+        for scenario_id, patient in ALL_PAYLOADS.items()
+    }
+
+
+def get_result(scenario_results, scenario_id):
+    """Return the cached NormalizedResult for scenario_id, re-raising a failed request"""
+    result = scenario_results[scenario_id]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+@functools.lru_cache(maxsize=None)
+def _alternation(terms):
+    """Compile a tuple of literal terms into one alternation, so one scan finds every hit"""
+    return re.compile('|'.join(map(re.escape, terms)))
+
+
+def first_positions(text, tokens):
+    """Return {token: index of its first occurrence in text, or -1}, from a single scan"""
+    positions = dict.fromkeys(tokens, -1)
+    for match in _alternation(tuple(tokens)).finditer(text):
+        if positions[match.group()] == -1:
+            positions[match.group()] = match.start()
+    return positions
+
+
+def check_result(normalized, expected):
+    """Assert that a NormalizedResult meets an expected-outcome spec"""
+    result = normalized.raw
+    recommendation = normalized.rec_lower
+
+    if 'category' in expected:
+        assert result['category'] == expected['category']
+
+    if 'min_confidence' in expected:
+        assert result['tuhs_confidence'] >= expected['min_confidence'], \
+            f"Confidence {result['tuhs_confidence']} below {expected['min_confidence']}"
+
+    for drug in expected.get('required', ()):
+        options = (drug,) if isinstance(drug, str) else drug
+        assert any(option in recommendation for option in options), \
+            f"❌ Missing {' or '.join(options)}"
+
+    forbidden = expected.get('forbidden')
+    if forbidden:
+        hits = _alternation(forbidden).findall(recommendation)
+        assert not hits, f"❌ CRITICAL SAFETY VIOLATION: {sorted(set(hits))} recommended!"
+
+    for first, second in expected.get('ordering', ()):
+        positions = first_positions(recommendation, (first, second))
+        if positions[second] != -1:
+            assert positions[first] < positions[second], f"❌ {second} mentioned before {first}"
 
-        result = await backend_bridge.process_request(patient_data)
 
-        # After dosing separation, Step 1 focuses on drug selection only
-        # Renal adjustments will be handled in Step 2 (dosing calculator)
-        # Just verify the request succeeds with reasonable confidence
-        assert result['tuhs_confidence'] >= 0.7, "Should have reasonable confidence for severe renal impairment case"
-        recommendation = result['tuhs_recommendation'].lower()
-        assert 'ceftriaxone' in recommendation, "Should recommend appropriate antibiotic for pyelonephritis"
+@pytest.mark.e2e
+@pytest.mark.critical
+class TestCriticalClinicalScenarios:
+    """E2E tests for critical clinical scenarios that must work correctly"""
+
+    @pytest.mark.parametrize('scenario_id', CLINICAL_CASES)
+    def test_clinical_scenario(self, scenario_results, scenario_id):
+        """Check one critical scenario's result against its expected outcome"""
+        check_result(get_result(scenario_results, scenario_id), CLINICAL_CASES[scenario_id][1])
+
+
+@pytest.mark.e2e
+class TestEdgeCases:
+    """E2E tests for edge cases and complex scenarios"""
+
+    @pytest.mark.parametrize('scenario_id', EDGE_CASES)
+    def test_edge_case(self, scenario_results, scenario_id):
+        """Check one edge case's result against its expected outcome"""
+        check_result(get_result(scenario_results, scenario_id), EDGE_CASES[scenario_id][1])
 
 
 @pytest.mark.e2e
@@ -287,21 +373,11 @@ class TestEdgeCases:
 class TestConsistency:
     """Test that similar cases produce consistent results"""
 
-    @pytest.mark.asyncio
-    async def test_same_input_consistent_output(self, backend_bridge):
-        """Test that identical input produces consistent results"""
-        patient_data = {
-            'age': '50',
-            'gender': 'female',
-            'location': 'Ward',
-            'infection_type': 'pyelonephritis',
-            'gfr': '70',
-            'allergies': 'None'
-        }
-
-        # Run twice
-        result1 = await backend_bridge.process_request(patient_data)
-        result2 = await backend_bridge.process_request(patient_data)
+    @pytest.mark.nightly
+    async def test_nondeterminism_bounded(self, backend_bridge):
+        """Test that two real backend runs on identical input stay consistent"""
+        result1 = await backend_bridge.process_request(CONSISTENCY_PATIENT)
+        result2 = await backend_bridge.process_request(CONSISTENCY_PATIENT)
 
         # Should get same category
         assert result1['category'] == result2['category']
@@ -309,34 +385,14 @@ class TestConsistency:
         # Should have similar confidence (within 10%)
         assert abs(result1['tuhs_confidence'] - result2['tuhs_confidence']) < 0.1
 
-    @pytest.mark.asyncio
-    async def test_similar_cases_similar_drugs(self, backend_bridge):
+    def test_similar_cases_similar_drugs(self, scenario_results):
         """Test that similar cases get similar drug recommendations"""
-        # Two similar pyelonephritis cases, slightly different ages
-        patient1 = {
-            'age': '35',
-            'gender': 'female',
-            'location': 'Ward',
-            'infection_type': 'pyelonephritis',
-            'gfr': '85',
-            'allergies': 'None'
-        }
-
-        patient2 = {
-            'age': '38',
-            'gender': 'female',
-            'location': 'Ward',
-            'infection_type': 'pyelonephritis',
-            'gfr': '80',
-            'allergies': 'None'
-        }
-
-        result1 = await backend_bridge.process_request(patient1)
-        result2 = await backend_bridge.process_request(patient2)
+        result1 = get_result(scenario_results, 'similar_case_1')
+        result2 = get_result(scenario_results, 'similar_case_2')
 
         # Both should recommend ceftriaxone
-        assert 'ceftriaxone' in result1['tuhs_recommendation'].lower()
-        assert 'ceftriaxone' in result2['tuhs_recommendation'].lower()
+        assert 'ceftriaxone' in result1.rec_lower
+        assert 'ceftriaxone' in result2.rec_lower
 
 
 if __name__ == '__main__':
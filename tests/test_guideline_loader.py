@@ -3,74 +3,98 @@ Unit tests for TUHSGuidelineLoader
 Tests JSON loading, parsing, and instruction generation
 """
 import pytest
+import functools
 import json
-import tempfile
-import os
 from agno_bridge_v2 import TUHSGuidelineLoader, InfectionCategory
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib json module
+    orjson = None
 
-class TestGuidelineLoader:
-    """Test suite for TUHSGuidelineLoader"""
 
-    @pytest.fixture
-    def temp_selection_json(self):
-        """Create temporary selection JSON for testing"""
-        data = {
-            "document_title": "Test Selection Guidelines",
-            "document_type": "Antibiotic Selection Guidelines",
-            "origin_date": "2025-01",
-            "caveat": "Test data",
-            "general_instructions": ["Test instruction 1", "Test instruction 2"],
-            "infection_guidelines": [
-                {
-                    "infection": "Test Infection",
-                    "sub_sections": [
-                        {
-                            "type": "Test Type",
-                            "empiric_regimens": [
-                                {
-                                    "pcp_allergy_status": "NO Penicillin (PCN) ALLERGY",
-                                    "regimen": ["Drug A", "Drug B"]
-                                }
-                            ]
-                        }
-                    ]
-                }
-            ]
-        }
+def _dump_json(data):
+    """Serialize data to JSON bytes, with orjson when installed"""
+    return orjson.dumps(data) if orjson is not None else json.dumps(data).encode()
+
+
+@pytest.fixture(scope="session")
+def loader():
+    """Loader over the real ABX_Selection.json / ABX_Dosing.json, parsed once per session"""
+    return TUHSGuidelineLoader()
+
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
-            json.dump(data, f)
-            temp_path = f.name
-
-        yield temp_path
-        os.unlink(temp_path)
-
-    @pytest.fixture
-    def temp_dosing_json(self):
-        """Create temporary dosing JSON for testing"""
-        data = {
-            "document_title": "Test Dosing Guidelines",
-            "document_type": "Antibiotic Dosing Guidelines",
-            "dosing_and_renal_adjustment": {
-                "calculation_notes": {"test": "notes"},
-                "renal_dosing_table": [
+@pytest.fixture(scope="session")
+def build_instructions(loader):
+    """loader.build_agent_instructions, computed once per (infection_type, subsection_filter).
+
+    Returns a tuple so the cached instructions cannot be mutated by a test.
+    """
+    @functools.lru_cache(maxsize=None)
+    def build(infection_type, subsection_filter=None):
+        return tuple(loader.build_agent_instructions(infection_type, subsection_filter=subsection_filter))
+
+    return build
+
+
+@pytest.fixture(scope="session")
+def temp_selection_json(tmp_path_factory):
+    """Temporary selection JSON for testing, written once per session"""
+    data = {
+        "document_title": "Test Selection Guidelines",
+        "document_type": "Antibiotic Selection Guidelines",
+        "origin_date": "2025-01",
+        "caveat": "Test data",
+        "general_instructions": ["Test instruction 1", "Test instruction 2"],
+        "infection_guidelines": [
+            {
+                "infection": "Test Infection",
+                "sub_sections": [
                     {
-                        "drug": "Test Drug IV",
-                        "ed_once_dose": "10 mg/kg",
-                        "crcl_gt_50": "10 mg/kg q8h",
-                        "crcl_50_30": "10 mg/kg q12h"
+                        "type": "Test Type",
+                        "empiric_regimens": [
+                            {
+                                "pcp_allergy_status": "NO Penicillin (PCN) ALLERGY",
+                                "regimen": ["Drug A", "Drug B"]
+                            }
+                        ]
                     }
                 ]
             }
+        ]
+    }
+
+    path = tmp_path_factory.mktemp('guidelines') / 'test_selection.json'
+    path.write_bytes(_dump_json(data))
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def temp_dosing_json(tmp_path_factory):
+    """Temporary dosing JSON for testing, written once per session"""
+    data = {
+        "document_title": "Test Dosing Guidelines",
+        "document_type": "Antibiotic Dosing Guidelines",
+        "dosing_and_renal_adjustment": {
+            "calculation_notes": {"test": "notes"},
+            "renal_dosing_table": [
+                {
+                    "drug": "Test Drug IV",
+                    "ed_once_dose": "10 mg/kg",
+                    "crcl_gt_50": "10 mg/kg q8h",
+                    "crcl_50_30": "10 mg/kg q12h"
+                }
+            ]
         }
+    }
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
-            json.dump(data, f)
-            temp_path = f.name
+    path = tmp_path_factory.mktemp('guidelines') / 'test_dosing.json'
+    path.write_bytes(_dump_json(data))
+    return str(path)
 
-        yield temp_path
-        os.unlink(temp_path)
+
+class TestGuidelineLoader:
+    """Test suite for TUHSGuidelineLoader"""
 
     @pytest.mark.unit
     def test_loader_initialization(self, temp_selection_json, temp_dosing_json):
@@ -85,10 +109,8 @@ class TestGuidelineLoader:
         assert loader.guidelines is not None
 
     @pytest.mark.unit
-    def test_loader_with_real_files(self):
+    def test_loader_with_real_files(self, loader):
         """Test loader works with actual ABX_Selection.json and ABX_Dosing.json"""
-        loader = TUHSGuidelineLoader()
-
         assert len(loader.selection_guidelines.get('infection_guidelines', [])) > 0
         assert len(loader.dosing_guidelines.get('dosing_and_renal_adjustment', {}).get('renal_dosing_table', [])) > 0
 
@@ -105,79 +127,87 @@ class TestGuidelineLoader:
         assert 'infection_guidelines' in loader.guidelines
 
     @pytest.mark.unit
-    def test_get_infection_guideline(self):
+    def test_get_infection_guideline(self, loader):
         """Test retrieving specific infection guideline"""
-        loader = TUHSGuidelineLoader()
-
         pneumonia = loader.get_infection_guideline("Pneumonia")
         assert pneumonia is not None
         assert pneumonia.get('infection') == 'Pneumonia'
 
     @pytest.mark.unit
-    def test_build_agent_instructions_pyelonephritis(self):
+    def test_build_agent_instructions_pyelonephritis(self, build_instructions):
         """Test instruction generation for pyelonephritis"""
-        loader = TUHSGuidelineLoader()
-
-        instructions = loader.build_agent_instructions('Urinary Tract', subsection_filter='Pyelonephritis')
+        instructions = build_instructions('Urinary Tract', 'Pyelonephritis')
+        blob = '\n'.join(instructions)
 
         assert len(instructions) > 50
         # Check for critical instructions
-        assert any('PYELONEPHRITIS-SPECIFIC WARNINGS' in line for line in instructions)
-        assert any('NEVER use Ciprofloxacin' in line for line in instructions)
-        assert any('Ceftriaxone IV is MANDATORY' in line for line in instructions)
-        assert any('DO NOT specify exact doses' in line for line in instructions)
+        assert 'PYELONEPHRITIS-SPECIFIC WARNINGS' in blob
+        assert 'NEVER use Ciprofloxacin' in blob
+        assert 'Ceftriaxone IV is MANDATORY' in blob
+        assert 'DO NOT specify exact doses' in blob
 
     @pytest.mark.unit
     @pytest.mark.allergy
-    def test_allergy_instructions_included(self):
+    def test_allergy_instructions_included(self, build_instructions):
         """Test that allergy handling instructions are included"""
-        loader = TUHSGuidelineLoader()
-
-        instructions = loader.build_agent_instructions('Sepsis')
+        blob = '\n'.join(build_instructions('Sepsis'))
 
-        allergy_section = [line for line in instructions if 'ALLERGY HANDLING' in line or 'ANAPHYLAXIS' in line]
-        assert len(allergy_section) > 0
-        assert any('ANAPHYLAXIS = SEVERE ALLERGY' in line for line in instructions)
-        assert any('Cefepime, Ceftriaxone, Cefazolin = ALL CEPHALOSPORINS = CONTRAINDICATED' in line for line in instructions)
+        assert 'ALLERGY HANDLING' in blob or 'ANAPHYLAXIS' in blob
+        assert 'ANAPHYLAXIS = SEVERE ALLERGY' in blob
+        assert 'Cefepime, Ceftriaxone, Cefazolin = ALL CEPHALOSPORINS = CONTRAINDICATED' in blob
 
     @pytest.mark.unit
-    def test_pregnancy_instructions_separated(self):
+    def test_pregnancy_instructions_separated(self, build_instructions):
         """Test that pregnancy instructions are separated by infection type"""
-        loader = TUHSGuidelineLoader()
-
         # Pyelonephritis should have pyelonephritis-specific pregnancy guidance
-        pyelo_instructions = loader.build_agent_instructions('Urinary Tract', subsection_filter='Pyelonephritis')
-        assert any('PYELONEPHRITIS-SPECIFIC PREGNANCY GUIDANCE' in line for line in pyelo_instructions)
-        assert any('Ceftriaxone IV is MANDATORY first-line' in line for line in pyelo_instructions)
+        pyelo_blob = '\n'.join(build_instructions('Urinary Tract', 'Pyelonephritis'))
+        assert 'PYELONEPHRITIS-SPECIFIC PREGNANCY GUIDANCE' in pyelo_blob
+        assert 'Ceftriaxone IV is MANDATORY first-line' in pyelo_blob
 
         # Cystitis should have cystitis-specific pregnancy guidance
-        cystitis_instructions = loader.build_agent_instructions('Urinary Tract', subsection_filter='Cystitis')
-        assert any('CYSTITIS-SPECIFIC PREGNANCY GUIDANCE' in line for line in cystitis_instructions)
+        cystitis_blob = '\n'.join(build_instructions('Urinary Tract', 'Cystitis'))
+        assert 'CYSTITIS-SPECIFIC PREGNANCY GUIDANCE' in cystitis_blob
 
     @pytest.mark.unit
-    def test_dosing_separation_instruction(self):
+    def test_dosing_separation_instruction(self, build_instructions):
         """Test that dosing separation instructions are present"""
-        loader = TUHSGuidelineLoader()
-
-        instructions = loader.build_agent_instructions('Pneumonia')
+        blob = '\n'.join(build_instructions('Pneumonia'))
 
-        dosing_section = [line for line in instructions if 'DRUG SELECTION ONLY' in line or 'DO NOT specify' in line]
-        assert len(dosing_section) > 0
-        assert any('DO NOT specify exact doses, frequencies, or durations' in line for line in instructions)
+        assert 'DRUG SELECTION ONLY' in blob or 'DO NOT specify' in blob
+        assert 'DO NOT specify exact doses, frequencies, or durations' in blob
 
 
 class TestInfectionCategory:
     """Test InfectionCategory enum"""
 
     @pytest.mark.unit
-    def test_infection_categories_exist(self):
+    @pytest.mark.parametrize('name', [
+        'PNEUMONIA', 'CYSTITIS', 'PYELONEPHRITIS', 'BACTEREMIA_SEPSIS', 'MENINGITIS', 'SKIN_SOFT_TISSUE'
+    ])
+    def test_infection_categories_exist(self, name):
         """Test that all infection categories are defined"""
-        assert hasattr(InfectionCategory, 'PNEUMONIA')
-        assert hasattr(InfectionCategory, 'CYSTITIS')
-        assert hasattr(InfectionCategory, 'PYELONEPHRITIS')
-        assert hasattr(InfectionCategory, 'BACTEREMIA_SEPSIS')
-        assert hasattr(InfectionCategory, 'MENINGITIS')
-        assert hasattr(InfectionCategory, 'SKIN_SOFT_TISSUE')
+        assert hasattr(InfectionCategory, name)
+
+
+def _get_path(data, key_path):
+    """Follow key_path into nested dicts, failing the test on the first missing key"""
+    for depth, key in enumerate(key_path):
+        assert key in data, f"Missing {'.'.join(key_path[:depth + 1])}"
+        data = data[key]
+    return data
+
+
+# (data fixture, key paths that must exist, key path of a list that must be non-empty)
+JSON_FILE_SPECS = [
+    pytest.param('abx_selection_data', [('infection_guidelines',)], ('infection_guidelines',),
+                 id='ABX_Selection.json'),
+    pytest.param('abx_dosing_data', [('dosing_and_renal_adjustment', 'renal_dosing_table')],
+                 ('dosing_and_renal_adjustment', 'renal_dosing_table'),
+                 id='ABX_Dosing.json'),
+    # Legacy combined file, still valid for backward compatibility
+    pytest.param('abx_legacy_data', [('infection_guidelines',), ('dosing_and_renal_adjustment',)], None,
+                 id='ABXguideInp.json'),
+]
 
 
 @pytest.mark.unit
@@ -185,51 +215,30 @@ class TestInfectionCategory:
 class TestJSONFileIntegrity:
     """Test that JSON files are valid and complete"""
 
-    def test_abx_selection_json_valid(self):
-        """Test ABX_Selection.json is valid JSON"""
-        with open('ABX_Selection.json', 'r') as f:
-            data = json.load(f)
-
-        assert 'infection_guidelines' in data
-        assert isinstance(data['infection_guidelines'], list)
-        assert len(data['infection_guidelines']) > 0
-
-    def test_abx_dosing_json_valid(self):
-        """Test ABX_Dosing.json is valid JSON"""
-        with open('ABX_Dosing.json', 'r') as f:
-            data = json.load(f)
+    @pytest.mark.parametrize('data_fixture,required_paths,list_path', JSON_FILE_SPECS)
+    def test_json_file_valid(self, request, data_fixture, required_paths, list_path):
+        """Test a guideline JSON file parses and has its required structure"""
+        data = request.getfixturevalue(data_fixture)
 
-        assert 'dosing_and_renal_adjustment' in data
-        assert 'renal_dosing_table' in data['dosing_and_renal_adjustment']
-        assert isinstance(data['dosing_and_renal_adjustment']['renal_dosing_table'], list)
+        for key_path in required_paths:
+            _get_path(data, key_path)
 
-    def test_legacy_json_valid(self):
-        """Test ABXguideInp.json is still valid for backward compatibility"""
-        with open('ABXguideInp.json', 'r') as f:
-            data = json.load(f)
+        if list_path is not None:
+            items = _get_path(data, list_path)
+            assert isinstance(items, list)
+            assert len(items) > 0
 
-        assert 'infection_guidelines' in data
-        assert 'dosing_and_renal_adjustment' in data
-
-    def test_infection_types_coverage(self):
+    @pytest.mark.parametrize('expected', ['Pneumonia', 'Urinary Tract', 'Sepsis'])
+    def test_infection_types_coverage(self, abx_selection_data, expected):
         """Test that all expected infection types are present"""
-        with open('ABX_Selection.json', 'r') as f:
-            data = json.load(f)
-
-        infection_types = [item['infection'] for item in data['infection_guidelines']]
+        infection_types = [item['infection'] for item in abx_selection_data['infection_guidelines']]
+        assert any(expected in inf_type for inf_type in infection_types), f"Missing {expected}"
 
-        expected_types = ['Pneumonia', 'Urinary Tract', 'Sepsis']
-        for expected in expected_types:
-            assert any(expected in inf_type for inf_type in infection_types), f"Missing {expected}"
-
-    def test_dosing_table_has_required_columns(self):
+    def test_dosing_table_has_required_columns(self, abx_dosing_data):
         """Test dosing table has all required columns"""
-        with open('ABX_Dosing.json', 'r') as f:
-            data = json.load(f)
-
         required_columns = ['drug', 'crcl_gt_50', 'crcl_50_30', 'crcl_29_10']
 
-        for entry in data['dosing_and_renal_adjustment']['renal_dosing_table']:
+        for entry in abx_dosing_data['dosing_and_renal_adjustment']['renal_dosing_table']:
             for col in required_columns:
                 assert col in entry, f"Missing required column {col} in entry {entry.get('drug')}"
 
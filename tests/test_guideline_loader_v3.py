@@ -11,23 +11,19 @@ Tests cover:
 """
 
 import pytest
-import sys
-from pathlib import Path
 
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Run the whole file on one pytest-xdist worker (loadfile-style within --dist loadgroup),
+# so the session guideline loader is only built by that worker
+pytestmark = [pytest.mark.xdist_group(name="guideline-loader-v3")]
 
-from lib.guideline_loader_v3 import GuidelineLoaderV3
+CEPHALOSPORINS = frozenset({'ceftriaxone', 'cefepime', 'cefazolin'})
+MILD_ALLERGY_CEPHALOSPORINS = frozenset({'ceftriaxone', 'cefepime'})
 
 
-@pytest.fixture
-def loader():
-    """Create and load GuidelineLoader instance"""
-    loader = GuidelineLoaderV3()
-    success = loader.load_all()
-    assert success, "Failed to load guidelines"
-    return loader
+@pytest.fixture(scope="session")
+def loader(guideline_loader_v3):
+    """The session's loaded GuidelineLoaderV3 (shared via conftest.py - do not mutate)"""
+    return guideline_loader_v3
 
 
 class TestLoading:
@@ -39,23 +35,32 @@ class TestLoading:
         assert len(loader.drugs) > 0, "No drug files loaded"
         assert len(loader.modifiers) > 0, "No modifier files loaded"
 
-    def test_expected_infections_loaded(self, loader):
-        """Test that expected infection types are loaded"""
-        expected = ['uti', 'pneumonia', 'intra_abdominal', 'bacteremia', 'meningitis']
-        for infection_type in expected:
-            assert infection_type in loader.infections, f"Missing infection: {infection_type}"
+    @pytest.mark.parametrize('infection_type', ['uti', 'pneumonia', 'intra_abdominal', 'bacteremia', 'meningitis'])
+    def test_expected_infection_loaded(self, loader, infection_type):
+        """Test that an expected infection type is loaded"""
+        assert infection_type in loader.infections, f"Missing infection: {infection_type}"
 
-    def test_expected_drugs_loaded(self, loader):
-        """Test that expected drugs are loaded"""
-        expected = ['ceftriaxone', 'aztreonam', 'piperacillin_tazobactam', 'vancomycin', 'metronidazole']
-        for drug_id in expected:
-            assert drug_id in loader.drugs, f"Missing drug: {drug_id}"
+    @pytest.mark.parametrize('drug_id', [
+        'ceftriaxone', 'aztreonam', 'piperacillin_tazobactam', 'vancomycin', 'metronidazole'
+    ])
+    def test_expected_drug_loaded(self, loader, drug_id):
+        """Test that an expected drug is loaded"""
+        assert drug_id in loader.drugs, f"Missing drug: {drug_id}"
 
-    def test_expected_modifiers_loaded(self, loader):
-        """Test that expected modifiers are loaded"""
-        expected = ['allergy_rules', 'pregnancy_rules', 'renal_adjustment_rules']
-        for modifier in expected:
-            assert modifier in loader.modifiers, f"Missing modifier: {modifier}"
+    @pytest.mark.parametrize('modifier', ['allergy_rules', 'pregnancy_rules', 'renal_adjustment_rules'])
+    def test_expected_modifier_loaded(self, loader, modifier):
+        """Test that an expected modifier is loaded"""
+        assert modifier in loader.modifiers, f"Missing modifier: {modifier}"
+
+    async def test_aload_all_matches_load_all(self, loader):
+        """Test that the concurrent async loader reads the same guidelines as load_all()"""
+        from lib.guideline_loader_v3 import GuidelineLoaderV3
+
+        async_loader = GuidelineLoaderV3()
+        assert await async_loader.aload_all(), "Failed to load guidelines"
+        assert async_loader.infections == loader.infections
+        assert async_loader.drugs == loader.drugs
+        assert async_loader.modifiers == loader.modifiers
 
 
 class TestInfectionQueries:
@@ -168,23 +173,19 @@ class TestCriticalSafetyRules:
         """Test severe PCN allergy never gets cephalosporins"""
         # Check intra-abdominal with severe allergy
         regimens = loader.get_infection_regimens('intra_abdominal', allergy_status='severe_pcn_allergy')
-        cephalosporins = ['ceftriaxone', 'cefepime', 'cefazolin']
         for regimen in regimens:
             drugs = regimen.get('drugs', [])
-            for drug in drugs:
-                assert drug not in cephalosporins, f"Severe PCN allergy should not get {drug}"
+            assert CEPHALOSPORINS.isdisjoint(drugs), \
+                f"Severe PCN allergy should not get {sorted(CEPHALOSPORINS.intersection(drugs))}"
 
     def test_mild_pcn_allergy_can_use_cephalosporins(self, loader):
         """Test mild PCN allergy (rash) CAN use cephalosporins"""
         regimens = loader.get_infection_regimens('uti', 'pyelonephritis', 'mild_pcn_allergy')
         assert len(regimens) > 0, "Should have regimens for mild PCN allergy"
         # Should allow ceftriaxone or other cephalosporins
-        cephalosporins_allowed = False
-        for regimen in regimens:
-            drugs = regimen.get('drugs', [])
-            if any(drug in ['ceftriaxone', 'cefepime'] for drug in drugs):
-                cephalosporins_allowed = True
-                break
+        cephalosporins_allowed = any(
+            not MILD_ALLERGY_CEPHALOSPORINS.isdisjoint(regimen.get('drugs', [])) for regimen in regimens
+        )
         assert cephalosporins_allowed, "Mild PCN allergy should allow cephalosporins"
 
 
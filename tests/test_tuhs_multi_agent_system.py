@@ -0,0 +1,136 @@
+"""
+Unit tests for the TUHS multi-agent manager
+Tests infection category routing and the response cache without calling any model
+"""
+import pytest
+
+tuhs = pytest.importorskip("tuhs_multi_agent_system")
+InfectionCategory = tuhs.InfectionCategory
+
+
+@pytest.fixture
+def manager():
+    """TUHSManagerAgent with no category agents, model or storage - never calls an LLM"""
+    return tuhs.TUHSManagerAgent(category_agents={})
+
+
+@pytest.fixture
+def pipeline_calls(manager):
+    """Replace the agent pipeline with a stub; returns the patients it was run for"""
+    calls = []
+
+    async def run_pipeline(patient_data):
+        calls.append(patient_data)
+        return {'response_for': dict(patient_data), 'run': len(calls)}
+
+    manager._run_pipeline = run_pipeline
+    return calls
+
+
+class TestDetermineCategory:
+    """Test infection_type -> InfectionCategory routing"""
+
+    @pytest.mark.parametrize('infection_type,expected', [
+        ('pneumonia', InfectionCategory.PNEUMONIA),
+        ('uti', InfectionCategory.UTI),
+        ('pyelonephritis', InfectionCategory.UTI),
+        ('skin', InfectionCategory.SKIN_SOFT_TISSUE),
+        ('intra', InfectionCategory.INTRA_ABDOMINAL),
+        ('bone', InfectionCategory.BONE_JOINT),
+        ('joint', InfectionCategory.BONE_JOINT),
+        ('meningitis', InfectionCategory.MENINGITIS),
+        ('sepsis', InfectionCategory.BACTEREMIA_SEPSIS),
+    ])
+    def test_exact_keywords(self, manager, infection_type, expected):
+        """Test the exact keyword table"""
+        assert manager._determine_category({'infection_type': infection_type}) == expected
+
+    @pytest.mark.parametrize('infection_type,expected', [
+        ('Acute Pyelonephritis', InfectionCategory.UTI),
+        ('catheter_associated_uti', InfectionCategory.UTI),
+        ('community-acquired pneumonia', InfectionCategory.PNEUMONIA),
+        ('skin_soft_tissue', InfectionCategory.SKIN_SOFT_TISSUE),
+        ('intra-abdominal abscess', InfectionCategory.INTRA_ABDOMINAL),
+        ('intra_abdominal', InfectionCategory.INTRA_ABDOMINAL),
+        ('bone and joint infection', InfectionCategory.BONE_JOINT),
+        ('vertebral osteomyelitis', InfectionCategory.BONE_JOINT),
+        ('bacterial meningitis', InfectionCategory.MENINGITIS),
+        ('MRSA bacteremia', InfectionCategory.BACTEREMIA_SEPSIS),
+    ])
+    def test_free_text_phrases(self, manager, infection_type, expected):
+        """Test whole-word category phrases inside free text"""
+        assert manager._determine_category({'infection_type': infection_type}) == expected
+
+    @pytest.mark.parametrize('infection_type', [
+        'intracranial abscess',
+        'intravascular catheter infection',
+        'febrile neutropenia after bone marrow transplant',
+        'endocarditis',
+        '',
+    ])
+    def test_near_misses_fall_back_to_general(self, manager, infection_type):
+        """Test that category prefixes inside other words do not misroute"""
+        assert manager._determine_category({'infection_type': infection_type}) == InfectionCategory.GENERAL
+
+    def test_missing_infection_type(self, manager):
+        """Test a payload without infection_type routes to GENERAL"""
+        assert manager._determine_category({}) == InfectionCategory.GENERAL
+
+
+class TestResponseCache:
+    """Test the manager's LRU of final responses"""
+
+    async def test_identical_payload_is_a_cache_hit(self, manager, pipeline_calls):
+        """Test that an identical patient payload reuses the first response"""
+        first = await manager.process_request({'infection_type': 'uti', 'age': 70})
+        second = await manager.process_request({'age': 70, 'infection_type': 'uti'})
+        assert second is first
+        assert len(pipeline_calls) == 1
+
+    async def test_different_payload_runs_pipeline(self, manager, pipeline_calls):
+        """Test that a different patient payload is not served from the cache"""
+        await manager.process_request({'infection_type': 'uti', 'age': 70})
+        await manager.process_request({'infection_type': 'uti', 'age': 71})
+        assert len(pipeline_calls) == 2
+
+    async def test_evicts_least_recently_used(self, manager, pipeline_calls):
+        """Test that the cache holds RESPONSE_CACHE_SIZE entries and evicts the least recently used"""
+        size = tuhs.RESPONSE_CACHE_SIZE
+        for age in range(size):
+            await manager.process_request({'age': age})
+        # Touch age 0 so age 1 becomes the least recently used entry
+        await manager.process_request({'age': 0})
+        assert len(pipeline_calls) == size
+
+        await manager.process_request({'age': size})
+        assert len(manager._response_cache) == size
+
+        await manager.process_request({'age': 0})
+        assert len(pipeline_calls) == size + 1, "Recently used entry should survive eviction"
+        await manager.process_request({'age': 1})
+        assert len(pipeline_calls) == size + 2, "Least recently used entry should be evicted"
+
+    async def test_invalidate_drops_cached_responses(self, manager, pipeline_calls):
+        """Test that invalidate_response_cache forces the pipeline to run again"""
+        patient = {'infection_type': 'pneumonia'}
+        first = await manager.process_request(patient)
+        manager.invalidate_response_cache()
+        second = await manager.process_request(patient)
+        assert second is not first
+        assert len(pipeline_calls) == 2
+
+    async def test_reload_guidelines_invalidates_cache(self, manager, pipeline_calls):
+        """Test that reloading the guideline knowledge base invalidates cached responses"""
+        reloads = []
+
+        class FakeKnowledge:
+            async def aload(self, recreate=False):
+                reloads.append(recreate)
+
+        manager.guideline_knowledge = FakeKnowledge()
+        patient = {'infection_type': 'meningitis'}
+        await manager.process_request(patient)
+        await manager.reload_guidelines()
+        await manager.process_request(patient)
+        assert reloads == [True]
+        assert len(pipeline_calls) == 2
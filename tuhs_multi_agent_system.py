@@ -6,10 +6,22 @@ Advanced Agno Agent Architecture with Category-Specific Agents
 import asyncio
 import json
 import os
-from typing import Dict, List, Optional, Any
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the stdlib json module
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (and unavailable on Windows) - use the default asyncio loop
+    uvloop = None
+
 # Agno imports
 from agno.agent import Agent
 from agno.models.openrouter import OpenRouter
@@ -30,6 +42,15 @@ from lib.clinicalTools import clinicalTools
 DB_URL = "postgresql://localhost:5432/tuhs_abx"
 VECTOR_DB_URL = f"{DB_URL}_vector"
 
+# Most recent manager responses kept for identical patient payloads
+RESPONSE_CACHE_SIZE = 256
+
+def _dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize obj to a JSON string, with orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else None).decode()
+    return json.dumps(obj, sort_keys=sort_keys)
+
 class InfectionCategory(str, Enum):
     PNEUMONIA = "pneumonia"
     UTI = "uti"
@@ -41,7 +62,76 @@ class InfectionCategory(str, Enum):
     NEUTROPENIC_FEVER = "neutropenic_fever"
     GENERAL = "general"
 
-@dataclass
+# Exact infection_type keyword -> category. Simple mapping - can be enhanced with ML classification.
+_CATEGORY_MAP = {
+    'pneumonia': InfectionCategory.PNEUMONIA,
+    'uti': InfectionCategory.UTI,
+    'cystitis': InfectionCategory.UTI,
+    'pyelonephritis': InfectionCategory.UTI,
+    'skin': InfectionCategory.SKIN_SOFT_TISSUE,
+    'cellulitis': InfectionCategory.SKIN_SOFT_TISSUE,
+    'ssti': InfectionCategory.SKIN_SOFT_TISSUE,
+    'intra': InfectionCategory.INTRA_ABDOMINAL,
+    'bone': InfectionCategory.BONE_JOINT,
+    'joint': InfectionCategory.BONE_JOINT,
+    'meningitis': InfectionCategory.MENINGITIS,
+    'bacteremia': InfectionCategory.BACTEREMIA_SEPSIS,
+    'sepsis': InfectionCategory.BACTEREMIA_SEPSIS,
+}
+
+# Free-text fallback: the first whole-word category phrase anywhere in infection_type,
+# named after the InfectionCategory member it maps to. Only letters and digits continue a
+# word, so "acute_pyelonephritis" or "intra-abdominal abscess" map, while bare prefixes
+# such as "intra" or "bone" are not matched inside "intracranial" or "bone marrow".
+_CATEGORY_RE = re.compile(
+    r"(?<![a-z0-9])(?:"
+    r"(?P<UTI>pyelonephritis|cystitis|uti)"
+    r"|(?P<PNEUMONIA>pneumonia)"
+    r"|(?P<SKIN_SOFT_TISSUE>cellulitis|ssti|skin)"
+    r"|(?P<INTRA_ABDOMINAL>intra[-_ ]?abdominal)"
+    r"|(?P<BONE_JOINT>bone[-_ ](?:(?:and|&)[-_ ])?joint|osteomyelitis|septic[-_ ]arthritis|prosthetic[-_ ]joint)"
+    r"|(?P<MENINGITIS>meningitis)"
+    r"|(?P<BACTEREMIA_SEPSIS>bacteremia|sepsis)"
+    r")(?![a-z0-9])",
+    re.IGNORECASE
+)
+
+# Uncertainty indicators in a category agent response that call for an evidence search
+_UNCERTAIN_RE = re.compile(r"uncertain|consider|may require|discuss with id", re.IGNORECASE)
+
+# Per-category agent knowledge - shared, immutable tuples built once at import
+_COMMON_REGIMENS: Dict[InfectionCategory, Tuple[str, ...]] = {
+    InfectionCategory.PNEUMONIA: (
+        "Ceftriaxone + Azithromycin",
+        "Piperacillin-tazobactam + Vancomycin",
+        "Levofloxacin + Aztreonam"
+    ),
+    InfectionCategory.UTI: (
+        "Ceftriaxone",
+        "Piperacillin-tazobactam + Vancomycin",
+        "Nitrofurantoin"
+    ),
+    InfectionCategory.SKIN_SOFT_TISSUE: (
+        "Cefazolin",
+        "Vancomycin",
+        "Piperacillin-tazobactam + Vancomycin"
+    )
+}
+
+_KEY_CONSIDERATIONS: Dict[InfectionCategory, Tuple[str, ...]] = {
+    InfectionCategory.PNEUMONIA: (
+        "MRSA risk factors",
+        "Pseudomonas risk factors",
+        "Aspiration risk"
+    ),
+    InfectionCategory.UTI: (
+        "Catheter-associated",
+        "Upper vs lower tract",
+        "Recent antibiotics"
+    )
+}
+
+@dataclass(slots=True)
 class AgentContext:
     """Context shared between agents"""
     patient_data: Dict[str, Any]
@@ -81,42 +171,13 @@ class TUHSCategoryAgent(Agent):
             "key_considerations": self._get_key_considerations()
         }
 
-    def _get_common_regimens(self) -> List[str]:
+    def _get_common_regimens(self) -> Tuple[str, ...]:
         """Get common regimens for this category"""
-        regimens = {
-            InfectionCategory.PNEUMONIA: [
-                "Ceftriaxone + Azithromycin",
-                "Piperacillin-tazobactam + Vancomycin",
-                "Levofloxacin + Aztreonam"
-            ],
-            InfectionCategory.UTI: [
-                "Ceftriaxone",
-                "Piperacillin-tazobactam + Vancomycin",
-                "Nitrofurantoin"
-            ],
-            InfectionCategory.SKIN_SOFT_TISSUE: [
-                "Cefazolin",
-                "Vancomycin",
-                "Piperacillin-tazobactam + Vancomycin"
-            ]
-        }
-        return regimens.get(self.category, [])
+        return _COMMON_REGIMENS.get(self.category, ())
 
-    def _get_key_considerations(self) -> List[str]:
+    def _get_key_considerations(self) -> Tuple[str, ...]:
         """Get key considerations for this category"""
-        considerations = {
-            InfectionCategory.PNEUMONIA: [
-                "MRSA risk factors",
-                "Pseudomonas risk factors",
-                "Aspiration risk"
-            ],
-            InfectionCategory.UTI: [
-                "Catheter-associated",
-                "Upper vs lower tract",
-                "Recent antibiotics"
-            ]
-        }
-        return considerations.get(self.category, [])
+        return _KEY_CONSIDERATIONS.get(self.category, ())
 
 class VectorMemoryAgent(Agent):
     """Backup agent using vector memory for uncertain cases"""
@@ -151,6 +212,10 @@ class TUHSManagerAgent(Agent):
         self.vector_agent = None
         self.evidence_agent = None
         self.output_formatter = None
+        self.guideline_knowledge = None
+        # LRU of final responses keyed by versioned canonical patient JSON
+        self._response_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self.cache_version = 0
 
         super().__init__(
             name="TUHS_Antibiotic_Manager",
@@ -158,74 +223,104 @@ class TUHSManagerAgent(Agent):
             **kwargs
         )
 
+    def invalidate_response_cache(self):
+        """Drop cached responses, e.g. after the guidelines are reloaded"""
+        self.cache_version += 1
+        self._response_cache.clear()
+
+    async def reload_guidelines(self, recreate: bool = True):
+        """Reload the TUHS guideline knowledge base and drop responses built from the old one"""
+        await self.guideline_knowledge.aload(recreate=recreate)
+        self.invalidate_response_cache()
+
     async def process_request(self, patient_data: Dict[str, Any]) -> Any:
         """Main workflow coordinator"""
+        # Identical patient payloads reuse the last response instead of re-running the pipeline
+        cache_key = f"{self.cache_version}:{_dumps(patient_data, sort_keys=True)}"
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+            return cached
+
+        final_response = await self._run_pipeline(patient_data)
+
+        self._response_cache[cache_key] = final_response
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+        return final_response
+
+    async def _run_pipeline(self, patient_data: Dict[str, Any]) -> Any:
+        """Run the category / evidence / vector / formatter agents for one patient"""
         context = AgentContext(patient_data=patient_data)
 
         # 1. Determine infection category
         category = self._determine_category(patient_data)
         context.infection_category = category
 
-        # 2. Query category-specific agent first
+        # 2. Query category-specific agent first (GENERAL maps to a fallback agent)
         category_agent = self.category_agents[category]
         category_response = await category_agent.arun(
-            f"Patient data: {json.dumps(patient_data)}. Provide recommendation based on TUHS guidelines.",
+            f"Patient data: {_dumps(patient_data)}. Provide recommendation based on TUHS guidelines.",
             context={"category_context": category_agent.category_knowledge}
         )
 
-        # 3. Check confidence and get additional evidence if needed
+        # 3. Get additional evidence if needed, and 4. use vector backup if confidence is low.
+        # The two lookups are independent, so whichever are needed run concurrently.
+        lookups = {}
         if self._needs_evidence(category_response):
-            evidence_response = await self.evidence_agent.arun(
+            lookups["evidence"] = self.evidence_agent.arun(
                 f"Find evidence-based literature for: {patient_data.get('infection_type', 'unknown infection')}",
                 context={"patient_context": patient_data}
             )
-            context.evidence_found = self._parse_evidence(evidence_response)
-
-        # 4. Use vector backup if confidence is low
         if self._confidence_too_low(category_response):
-            vector_response = await self.vector_agent.arun(
+            lookups["vector"] = self.vector_agent.arun(
                 f"Vector search for: {patient_data}",
                 context={"category": category.value}
             )
+        lookup_responses = dict(zip(lookups, await asyncio.gather(*lookups.values())))
+
+        if "evidence" in lookup_responses:
+            context.evidence_found = self._parse_evidence(lookup_responses["evidence"])
 
         # 5. Format final output
         final_response = await self.output_formatter.arun(
-            f"Format recommendation for: {json.dumps(context.__dict__)}",
+            self._formatter_prompt(context),
             context={"formatted_context": context}
         )
 
         return final_response
 
+    def _formatter_prompt(self, context: AgentContext) -> str:
+        """Build the formatter prompt from the context fields that are actually populated"""
+        # The full context object still goes to the formatter as structured context
+        parts = [
+            f"infection_category={context.infection_category.value}",
+            f"patient_data={_dumps(context.patient_data)}",
+        ]
+        if context.recommendations:
+            parts.append(f"recommendations={_dumps(context.recommendations[:3])}")
+        if context.confidence_scores:
+            parts.append(f"confidence_scores={_dumps(context.confidence_scores)}")
+        if context.evidence_found:
+            parts.append(f"evidence_n={len(context.evidence_found)}")
+        return f"Format recommendation for: {', '.join(parts)}"
+
     def _determine_category(self, patient_data: Dict[str, Any]) -> InfectionCategory:
         """Determine the most likely infection category"""
-        infection_type = patient_data.get('infection_type', '').lower()
-
-        # Simple mapping - can be enhanced with ML classification
-        category_map = {
-            'pneumonia': InfectionCategory.PNEUMONIA,
-            'uti': InfectionCategory.UTI,
-            'cystitis': InfectionCategory.UTI,
-            'pyelonephritis': InfectionCategory.UTI,
-            'skin': InfectionCategory.SKIN_SOFT_TISSUE,
-            'cellulitis': InfectionCategory.SKIN_SOFT_TISSUE,
-            'ssti': InfectionCategory.SKIN_SOFT_TISSUE,
-            'intra': InfectionCategory.INTRA_ABDOMINAL,
-            'bone': InfectionCategory.BONE_JOINT,
-            'joint': InfectionCategory.BONE_JOINT,
-            'meningitis': InfectionCategory.MENINGITIS,
-            'bacteremia': InfectionCategory.BACTEREMIA_SEPSIS,
-            'sepsis': InfectionCategory.BACTEREMIA_SEPSIS,
-        }
+        infection_type = patient_data.get('infection_type', '')
+        category = _CATEGORY_MAP.get(infection_type.strip().lower())
+        if category is not None:
+            return category
 
-        return category_map.get(infection_type, InfectionCategory.GENERAL)
+        match = _CATEGORY_RE.search(infection_type)
+        if match is None:
+            return InfectionCategory.GENERAL
+        return InfectionCategory[match.lastgroup]
 
     def _needs_evidence(self, response: Any) -> bool:
         """Determine if external evidence is needed"""
         # Check for uncertainty indicators in response
-        content = response.content.lower()
-        return any(indicator in content for indicator in [
-            'uncertain', 'consider', 'may require', 'discuss with id'
-        ])
+        return _UNCERTAIN_RE.search(response.content) is not None
 
     def _confidence_too_low(self, response: Any) -> bool:
         """Check if confidence is below threshold"""
@@ -287,6 +382,11 @@ async def create_tuhs_agent_system() -> Team:
                 markdown=True
             )
             category_agents[category] = agent
+    specialist_agents = list(category_agents.values())
+
+    # GENERAL has no dedicated specialist: route it to the broad-spectrum bacteremia/sepsis
+    # agent so every InfectionCategory resolves with a single dict lookup
+    category_agents[InfectionCategory.GENERAL] = category_agents[InfectionCategory.BACTEREMIA_SEPSIS]
 
     # Create specialized agents
     vector_agent = VectorMemoryAgent(
@@ -310,6 +410,7 @@ async def create_tuhs_agent_system() -> Team:
     # Set references for manager
     manager_agent.vector_agent = vector_agent
     manager_agent.evidence_agent = evidence_agent
+    manager_agent.guideline_knowledge = tuhs_knowledge
 
     output_formatter = OutputFormattingAgent(
         model=OpenRouter(id="google/gemini-2.5-flash-lite-preview"),
@@ -323,7 +424,7 @@ async def create_tuhs_agent_system() -> Team:
         name="TUHS_Antibiotic_Stewardship_Team",
         mode="coordinate",
         model=OpenRouter(id="google/gemini-2.5-pro-preview"),
-        members=list(category_agents.values()) + [vector_agent, evidence_agent, output_formatter],
+        members=specialist_agents + [vector_agent, evidence_agent, output_formatter],
         instructions=[
             "Coordinate between specialized TUHS agents",
             "Use category agents first, then evidence search",
@@ -359,7 +460,7 @@ async def main():
 
     # Process the request
     response = await tuhs_team.arun(
-        f"Provide antibiotic recommendation for: {json.dumps(patient_data)}",
+        f"Provide antibiotic recommendation for: {_dumps(patient_data)}",
         stream=True,
         show_full_reasoning=True
     )
@@ -367,4 +468,7 @@ async def main():
     print(response.content)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())